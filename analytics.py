@@ -4,6 +4,81 @@ from datetime import datetime
 from scipy.spatial import distance
 from sklearn.cluster import DBSCAN
 
+EARTH_RADIUS_KM = 6371.0088
+
+# Seasons (Northern Hemisphere) and, per month number, the index into SEASONS
+# (position 0 stands for a missing or invalid month)
+SEASONS = ['Winter', 'Spring', 'Summer', 'Fall', 'Unknown']
+SEASON_CODE_BY_MONTH = np.array([4, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+FLAG_COLUMNS = ['AccidentInvolvingPedestrian', 'AccidentInvolvingBicycle', 'AccidentInvolvingMotorcycle']
+
+def _flag(df, col):
+    # 'true'/'false' flag column as a numpy bool array (bool columns pass through)
+    values = df[col].to_numpy()
+    return values if values.dtype == bool else values == 'true'
+
+def value_counts_observed(series):
+    # value_counts() minus the zero rows a categorical reports for unobserved categories
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+def _derived_columns(df):
+    # The prepare_dataset columns df does not have yet, as a dict for df.assign
+    derived = {col: _norm_bool(df[col]).to_numpy() for col in FLAG_COLUMNS
+               if col in df.columns and df[col].dtype != bool}
+    
+    if 'AccidentSeverityCategory' in df.columns and '_fatal' not in df.columns:
+        severity = df['AccidentSeverityCategory']
+        derived['_fatal'] = (severity == 'as1').to_numpy(dtype=np.int8)
+        derived['_severe'] = (severity == 'as2').to_numpy(dtype=np.int8)
+        derived['_light'] = (severity == 'as3').to_numpy(dtype=np.int8)
+    
+    if 'AccidentMonth' in df.columns:
+        months = df['AccidentMonth'].to_numpy(dtype=np.float64)
+        if 'season' not in df.columns:
+            valid_month = (months >= 1) & (months <= 12)
+            # Month number indexes the season lookup table; 0 = Unknown
+            month_index = np.where(valid_month, months, 0).astype(np.int64)
+            derived['season'] = pd.Categorical.from_codes(SEASON_CODE_BY_MONTH[month_index],
+                                                          categories=SEASONS)
+        
+        if 'AccidentYear' in df.columns and '_year_month' not in df.columns:
+            year_month = df['AccidentYear'].to_numpy(dtype=np.float64) * 100 + months
+            derived['_year_month'] = np.where(np.isnan(year_month), -1, year_month).astype(np.int64)
+    
+    return derived
+
+def _with_derived_columns(df):
+    # df itself when it was prepared by prepare_dataset, otherwise a copy with the
+    # missing derived columns added (rows stay in their original order)
+    derived = _derived_columns(df)
+    return df.assign(**derived) if derived else df
+
+def prepare_dataset(df):
+    """
+    Derive the columns shared by the analytics functions once per loaded dataset.
+    
+    Involved-party flags not already converted by the loader become bool columns,
+    and the following are added:
+    _fatal/_severe/_light (int8 indicators of as1/as2/as3), _year_month
+    (year * 100 + month, -1 when either is missing) and season (categorical).
+    Rows are sorted by _year_month. The other functions in this module accept
+    raw loader output too, but then derive the columns they need on every call.
+    
+    Args:
+        df (pandas.DataFrame): Accident data as returned by load_accident_data
+        
+    Returns:
+        pandas.DataFrame: New DataFrame with the derived columns
+    """
+    prepared = _with_derived_columns(df)
+    
+    # Chronological row order lets filter_data select years/months by binary search
+    if '_year_month' in prepared.columns:
+        prepared = prepared.sort_values('_year_month', kind='stable')
+    return prepared
+
 def calculate_summary_stats(df):
     """
     Calculate comprehensive summary statistics for accident data.
@@ -21,7 +96,9 @@ def calculate_summary_stats(df):
     
     # Basic counts
     stats['total_accidents'] = len(df)
-    stats['unique_cantons'] = df['CantonCode'].nunique() if 'CantonCode' in df.columns else 0
+    # Count each categorical column once; distinct counts and top-N derive from it
+    canton_counts = value_counts_observed(df['CantonCode']) if 'CantonCode' in df.columns else None
+    stats['unique_cantons'] = len(canton_counts) if canton_counts is not None else 0
     stats['date_range'] = {
         'start_year': int(df['AccidentYear'].min()) if 'AccidentYear' in df.columns else None,
         'end_year': int(df['AccidentYear'].max()) if 'AccidentYear' in df.columns else None
@@ -29,32 +106,32 @@ def calculate_summary_stats(df):
     
     # Severity distribution
     if 'AccidentSeverityCategory_en' in df.columns:
-        stats['severity_distribution'] = df['AccidentSeverityCategory_en'].value_counts().to_dict()
+        stats['severity_distribution'] = value_counts_observed(df['AccidentSeverityCategory_en']).to_dict()
     
     # Accident types
     if 'AccidentType_en' in df.columns:
-        stats['top_accident_types'] = df['AccidentType_en'].value_counts().head(5).to_dict()
+        stats['top_accident_types'] = value_counts_observed(df['AccidentType_en']).head(5).to_dict()
     
     # Involved parties
     if 'AccidentInvolvingBicycle' in df.columns:
-        stats['bicycle_accidents'] = len(df[df['AccidentInvolvingBicycle'] == 'true'])
+        stats['bicycle_accidents'] = int(_flag(df, 'AccidentInvolvingBicycle').sum())
         stats['bicycle_percentage'] = (stats['bicycle_accidents'] / stats['total_accidents']) * 100
     
     if 'AccidentInvolvingPedestrian' in df.columns:
-        stats['pedestrian_accidents'] = len(df[df['AccidentInvolvingPedestrian'] == 'true'])
+        stats['pedestrian_accidents'] = int(_flag(df, 'AccidentInvolvingPedestrian').sum())
         stats['pedestrian_percentage'] = (stats['pedestrian_accidents'] / stats['total_accidents']) * 100
     
     if 'AccidentInvolvingMotorcycle' in df.columns:
-        stats['motorcycle_accidents'] = len(df[df['AccidentInvolvingMotorcycle'] == 'true'])
+        stats['motorcycle_accidents'] = int(_flag(df, 'AccidentInvolvingMotorcycle').sum())
         stats['motorcycle_percentage'] = (stats['motorcycle_accidents'] / stats['total_accidents']) * 100
     
     # Road type analysis
     if 'RoadType_en' in df.columns:
-        stats['road_type_distribution'] = df['RoadType_en'].value_counts().to_dict()
+        stats['road_type_distribution'] = value_counts_observed(df['RoadType_en']).to_dict()
     
     # Canton analysis
-    if 'CantonCode' in df.columns:
-        stats['top_cantons'] = df['CantonCode'].value_counts().head(10).to_dict()
+    if canton_counts is not None:
+        stats['top_cantons'] = canton_counts.head(10).to_dict()
     
     return stats
 
@@ -89,7 +166,7 @@ def create_temporal_analysis(df):
     
     # Day of week analysis
     if 'AccidentWeekDay_en' in df.columns:
-        weekday_counts = df.groupby('AccidentWeekDay_en').size()
+        weekday_counts = df.groupby('AccidentWeekDay_en', observed=True, sort=False).size()
         temporal_stats['weekday_distribution'] = weekday_counts.to_dict()
         temporal_stats['peak_weekday'] = weekday_counts.idxmax()
         temporal_stats['safest_weekday'] = weekday_counts.idxmin()
@@ -99,64 +176,87 @@ def create_temporal_analysis(df):
         yearly_counts = df.groupby('AccidentYear').size()
         temporal_stats['yearly_distribution'] = yearly_counts.to_dict()
         
-        # Calculate trend
-        years = list(yearly_counts.index)
-        counts = list(yearly_counts.values)
-        if len(years) > 1:
-            trend_slope = np.polyfit(years, counts, 1)[0]
+        # Calculate trend (closed-form least-squares slope)
+        if len(yearly_counts) > 1:
+            years = yearly_counts.index.to_numpy(dtype=np.float64)
+            counts = yearly_counts.to_numpy(dtype=np.float64)
+            years_dev = years - years.mean()
+            trend_slope = float((years_dev * (counts - counts.mean())).sum() / (years_dev ** 2).sum())
             temporal_stats['yearly_trend'] = 'increasing' if trend_slope > 0 else 'decreasing'
             temporal_stats['trend_slope'] = trend_slope
     
     return temporal_stats
 
 def _norm_bool(series):
-    # input are strings 'true'/'false' or NaN
+    # input are strings 'true'/'false' or NaN, or an already-boolean column
+    if series.dtype == bool:
+        return series
     return series.fillna('false').astype(str).str.lower().eq('true')
 
-def apply_party_filter(df, selected_parties, party_mode):
-    # Map labels to columns present in df
+def _party_mask(df, selected_parties, party_mode):
+    # Boolean ndarray for the involved-parties filter, or None when inactive
     cols = {
         "Pedestrian": "AccidentInvolvingPedestrian",
         "Bicycle": "AccidentInvolvingBicycle",
         "Motorcycle": "AccidentInvolvingMotorcycle",
     }
     present = {k: v for k, v in cols.items() if v in df.columns}
-    if not selected_parties:
-        return df  # no party filter
-
-    # Build boolean columns
-    party_bools = {k: _norm_bool(df[v]) for k, v in present.items()}
+    if not selected_parties or not present:
+        return None  # no party filter
 
     mode = (party_mode or "").lower()
 
-    if mode.startswith("any"):
-        # OR of selected
-        mask = None
-        for p in selected_parties:
-            if p in party_bools:
-                mask = party_bools[p] if mask is None else (mask | party_bools[p])
-        return df.loc[mask] if mask is not None else df
-
-    if "include all" in mode or mode.startswith("include"):
-        # AND of selected (others may be true)
+    if mode.startswith("any") or "include all" in mode or mode.startswith("include"):
+        # OR (any) / AND (include all) of selected, accumulated in one buffer
+        combine = np.logical_or if mode.startswith("any") else np.logical_and
         mask = None
         for p in selected_parties:
-            if p in party_bools:
-                mask = party_bools[p] if mask is None else (mask & party_bools[p])
-        return df.loc[mask] if mask is not None else df
+            if p in present:
+                flags = _norm_bool(df[present[p]]).to_numpy()
+                if mask is None:
+                    mask = flags.copy()  # may be a view of the column
+                else:
+                    combine(mask, flags, out=mask)
+        return mask
 
     # Default: Only selected (exact)
     # All selected must be true AND all unselected must be false
-    mask_parts = []
-    for p, s in party_bools.items():
+    mask = np.ones(len(df), dtype=bool)
+    for p, col in present.items():
+        flags = _norm_bool(df[col]).to_numpy()
         if p in selected_parties:
-            mask_parts.append(s)          # must be True
+            mask &= flags
         else:
-            mask_parts.append(~s)         # must be False
-    exact_mask = mask_parts[0]
-    for m in mask_parts[1:]:
-        exact_mask &= m
-    return df.loc[exact_mask]
+            mask[flags] = False
+    return mask
+
+def apply_party_filter(df, selected_parties, party_mode):
+    mask = _party_mask(df, selected_parties, party_mode)
+    return df.loc[mask] if mask is not None else df
+
+def _isin_mask(df, col, values):
+    # Hash-based membership test (uses category codes when the column is categorical)
+    return df[col].isin(values).to_numpy()
+
+def _sorted_period_mask(df, years, months):
+    # On a frame sorted by _year_month (see prepare_dataset) every selected (year, month)
+    # is a contiguous block, located by binary search instead of scanning the columns.
+    # None when the shortcut does not apply.
+    if not years or '_year_month' not in df.columns:
+        return None
+    year_month = df['_year_month']
+    if not year_month.is_monotonic_increasing or (len(year_month) and year_month.iat[0] < 0):
+        return None
+    
+    keys = year_month.to_numpy()
+    month_bounds = [(int(m), int(m)) for m in months] if months else [(0, 99)]
+    mask = np.zeros(len(keys), dtype=bool)
+    for year in years:
+        for first, last in month_bounds:
+            start = np.searchsorted(keys, int(year) * 100 + first, side='left')
+            stop = np.searchsorted(keys, int(year) * 100 + last, side='right')
+            mask[start:stop] = True
+    return mask
 
 def filter_data(df, years=None, severities=None, accident_types=None, road_types=None, 
                 cantons=None, selected_parties=None, party_mode=None,
@@ -180,49 +280,57 @@ def filter_data(df, years=None, severities=None, accident_types=None, road_types
     Returns:
         pandas.DataFrame: Filtered data
     """
-    filtered_df = df.copy()
-    mask = pd.Series(True, index=filtered_df.index, dtype=bool)
+    # All predicates are AND-ed into one boolean array; a single take at the end
+    # avoids a copy of the full frame plus one intermediate frame per filter.
+    mask = np.ones(len(df), dtype=bool)
     
-    # Year filter
-    if years and 'AccidentYear' in filtered_df.columns:
-        mask &= filtered_df['AccidentYear'].isin(years)
+    # Year filter (covers the month filter too when the sorted shortcut applies)
+    period_mask = _sorted_period_mask(df, years, months)
+    if period_mask is not None:
+        mask &= period_mask
+    elif years and 'AccidentYear' in df.columns:
+        mask &= _isin_mask(df, 'AccidentYear', years)
     
     # Severity filter
-    if severities and 'AccidentSeverityCategory_en' in filtered_df.columns:
-        mask &= filtered_df['AccidentSeverityCategory_en'].isin(severities)
+    if severities and 'AccidentSeverityCategory_en' in df.columns:
+        mask &= _isin_mask(df, 'AccidentSeverityCategory_en', severities)
     
     # Accident type filter
-    if accident_types and 'AccidentType_en' in filtered_df.columns:
-        mask &= filtered_df['AccidentType_en'].isin(accident_types)
+    if accident_types and 'AccidentType_en' in df.columns:
+        mask &= _isin_mask(df, 'AccidentType_en', accident_types)
     
     # Road type filter
-    if road_types and 'RoadType_en' in filtered_df.columns:
-        mask &= filtered_df['RoadType_en'].isin(road_types)
+    if road_types and 'RoadType_en' in df.columns:
+        mask &= _isin_mask(df, 'RoadType_en', road_types)
     
     # Canton filter
-    if cantons and 'CantonCode' in filtered_df.columns:
-        mask &= filtered_df['CantonCode'].isin(cantons)
+    if cantons and 'CantonCode' in df.columns:
+        mask &= _isin_mask(df, 'CantonCode', cantons)
     
     # Involved parties filter
-    filtered_df = apply_party_filter(filtered_df, selected_parties, party_mode)
+    party_mask = _party_mask(df, selected_parties, party_mode)
+    if party_mask is not None:
+        mask &= party_mask
     
     # Month filter
-    if months and 'AccidentMonth' in filtered_df.columns:
-        mask &= filtered_df['AccidentMonth'].isin(months)
+    if months and period_mask is None and 'AccidentMonth' in df.columns:
+        mask &= _isin_mask(df, 'AccidentMonth', months)
     
     # Hour range filter
-    if hour_range and 'AccidentHour' in filtered_df.columns:
+    if hour_range and 'AccidentHour' in df.columns:
         start_hour, end_hour = hour_range
-        mask &= (filtered_df['AccidentHour'] >= start_hour) & (filtered_df['AccidentHour'] <= end_hour)
+        hours = df['AccidentHour'].to_numpy()
+        mask &= (hours >= start_hour) & (hours <= end_hour)
     
-    return filtered_df.loc[mask].copy()
+    return df.iloc[np.flatnonzero(mask)]
 
 def calculate_risk_metrics(df):
     """
     Calculate risk metrics for different categories.
     
     Args:
-        df (pandas.DataFrame): Accident data
+        df (pandas.DataFrame): Accident data, preferably from prepare_dataset (missing
+                               derived columns are computed on each call)
         
     Returns:
         dict: Risk metrics
@@ -230,41 +338,42 @@ def calculate_risk_metrics(df):
     if df.empty:
         return {}
     
+    df = _with_derived_columns(df)
     risk_metrics = {}
     
     # Overall risk by severity
     total_accidents = len(df)
-    if 'AccidentSeverityCategory' in df.columns:
-        fatal_rate = len(df[df['AccidentSeverityCategory'] == 'as1']) / total_accidents * 100
-        severe_rate = len(df[df['AccidentSeverityCategory'] == 'as2']) / total_accidents * 100
+    if '_fatal' in df.columns:
+        fatal_rate = int(df['_fatal'].sum()) / total_accidents * 100
+        severe_rate = int(df['_severe'].sum()) / total_accidents * 100
         
         risk_metrics['fatal_accident_rate'] = fatal_rate
         risk_metrics['severe_accident_rate'] = severe_rate
     
-    # Risk by road type
+    # Risk by road type (grouped mean of a 0/1 fatal indicator, no per-group Python call)
     if 'RoadType_en' in df.columns:
-        road_risk = df.groupby('RoadType_en').agg({
-            'AccidentSeverityCategory': lambda x: (x == 'as1').sum() / len(x) * 100 if len(x) > 0 else 0
-        }).round(2)
-        risk_metrics['road_type_fatal_rates'] = road_risk.to_dict()['AccidentSeverityCategory']
+        road_risk = df['_fatal'].groupby(df['RoadType_en'], observed=True, sort=False).mean().mul(100).round(2)
+        risk_metrics['road_type_fatal_rates'] = road_risk.to_dict()
     
-    # Risk by time of day
+    # Risk by time of day (same pattern with a severe-or-fatal indicator)
     if 'AccidentHour' in df.columns:
-        hourly_risk = df.groupby('AccidentHour').agg({
-            'AccidentSeverityCategory': lambda x: (x.isin(['as1', 'as2'])).sum() / len(x) * 100 if len(x) > 0 else 0
-        }).round(2)
-        risk_metrics['hourly_severe_rates'] = hourly_risk.to_dict()['AccidentSeverityCategory']
+        is_severe_or_fatal = df['_fatal'] | df['_severe']
+        hourly_risk = is_severe_or_fatal.groupby(df['AccidentHour'], sort=False).mean().mul(100).round(2)
+        risk_metrics['hourly_severe_rates'] = hourly_risk.to_dict()
     
     # Bicycle-specific risks
     if 'AccidentInvolvingBicycle' in df.columns:
-        bicycle_df = df[df['AccidentInvolvingBicycle'] == 'true']
-        if not bicycle_df.empty:
-            bicycle_fatal_rate = len(bicycle_df[bicycle_df['AccidentSeverityCategory'] == 'as1']) / len(bicycle_df) * 100
+        bicycle_mask = _flag(df, 'AccidentInvolvingBicycle')
+        bicycle_total = int(bicycle_mask.sum())
+        if bicycle_total:
+            fatal_mask = df['_fatal'].to_numpy(dtype=bool)
+            bicycle_fatal_rate = np.count_nonzero(bicycle_mask & fatal_mask) / bicycle_total * 100
             risk_metrics['bicycle_fatal_rate'] = bicycle_fatal_rate
             
             # Peak risk hours for cyclists
-            if 'AccidentHour' in bicycle_df.columns:
-                bicycle_hourly = bicycle_df.groupby('AccidentHour').size()
+            if 'AccidentHour' in df.columns:
+                bicycle_hours = df['AccidentHour'][bicycle_mask]
+                bicycle_hourly = bicycle_hours.groupby(bicycle_hours).size()
                 risk_metrics['bicycle_peak_hours'] = bicycle_hourly.nlargest(3).index.tolist()
     
     return risk_metrics
@@ -290,7 +399,7 @@ def generate_insights(df):
     
     # Severity insights
     if 'AccidentSeverityCategory_en' in df.columns:
-        severity_counts = df['AccidentSeverityCategory_en'].value_counts()
+        severity_counts = value_counts_observed(df['AccidentSeverityCategory_en'])
         most_common_severity = severity_counts.index[0]
         insights.append(f"Most accidents result in {most_common_severity.lower()} ({severity_counts.iloc[0]:,} cases).")
         
@@ -301,13 +410,16 @@ def generate_insights(df):
     
     # Bicycle safety insights
     if 'AccidentInvolvingBicycle' in df.columns:
-        bicycle_accidents = len(df[df['AccidentInvolvingBicycle'] == 'true'])
+        bicycle_mask = _flag(df, 'AccidentInvolvingBicycle')
+        bicycle_accidents = int(bicycle_mask.sum())
         bicycle_rate = (bicycle_accidents / total_accidents) * 100
         insights.append(f"Bicycles are involved in {bicycle_rate:.1f}% of all accidents ({bicycle_accidents:,} cases).")
         
-        bicycle_df = df[df['AccidentInvolvingBicycle'] == 'true']
-        if not bicycle_df.empty and 'AccidentHour' in bicycle_df.columns:
-            peak_hour = bicycle_df['AccidentHour'].mode().iloc[0]
+        bicycle_hours = (df['AccidentHour'][bicycle_mask].dropna().to_numpy(dtype=np.int64)
+                         if 'AccidentHour' in df.columns else [])
+        if len(bicycle_hours):
+            # Most frequent hour (earliest on ties) from an hour-of-day histogram
+            peak_hour = int(np.bincount(bicycle_hours).argmax())
             insights.append(f"Peak risk hour for cyclists is {peak_hour}:00-{peak_hour+1}:00.")
     
     # Temporal insights
@@ -330,12 +442,28 @@ def generate_insights(df):
     
     return insights
 
+def _most_common_by_group(group_ids, series, n_groups):
+    # Most frequent value of series for each group id in [0, n_groups), counted with a
+    # single bincount over (group, value code) pairs. Ties go to the smallest value, as
+    # with mode(); groups without values get 'Unknown'.
+    codes, uniques = pd.factorize(series, sort=True)
+    valid = codes >= 0
+    n_values = len(uniques) + 1
+    counts = np.bincount(group_ids[valid] * n_values + codes[valid],
+                         minlength=n_groups * n_values).reshape(n_groups, n_values)
+    top = counts.argmax(axis=1)
+    top[counts.max(axis=1) == 0] = len(uniques)
+    labels = np.append(np.asarray(uniques, dtype=object), 'Unknown')
+    return pd.Series(labels[top])
+
 def identify_blackspot_zones(df, eps_km=0.5, min_samples=5):
     """
     Identify accident blackspot zones using DBSCAN clustering.
     
     Args:
-        df (pandas.DataFrame): Accident data with latitude and longitude
+        df (pandas.DataFrame): Accident data with latitude and longitude, preferably
+                               from prepare_dataset (missing derived columns are
+                               computed on each call)
         eps_km (float): Maximum distance (in km) between points to be in same cluster
         min_samples (int): Minimum number of accidents to form a blackspot
         
@@ -345,59 +473,58 @@ def identify_blackspot_zones(df, eps_km=0.5, min_samples=5):
     if df.empty or len(df) < min_samples:
         return pd.DataFrame()
     
-    # Extract coordinates
-    coords = df[['latitude', 'longitude']].values
+    df = _with_derived_columns(df)
     
-    # Convert eps from km to degrees (rough approximation: 1 degree ≈ 111 km)
-    eps_degrees = eps_km / 111.0
+    # Extract coordinates in radians for the haversine metric
+    coords = np.radians(df[['latitude', 'longitude']].to_numpy(dtype=float))
     
-    # Perform DBSCAN clustering
-    clustering = DBSCAN(eps=eps_degrees, min_samples=min_samples, metric='euclidean')
-    df['cluster'] = clustering.fit_predict(coords)
+    # Convert eps from km to radians on the Earth's mean radius
+    eps_radians = eps_km / EARTH_RADIUS_KM
+    
+    # Perform DBSCAN clustering (ball tree supports haversine; neighbour queries run on all cores)
+    clustering = DBSCAN(eps=eps_radians, min_samples=min_samples, metric='haversine',
+                        algorithm='ball_tree', n_jobs=-1)
+    labels = clustering.fit_predict(coords)
     
     # Analyze clusters (exclude noise points with cluster = -1)
-    blackspots = []
+    in_cluster = labels != -1
+    if not in_cluster.any():
+        return pd.DataFrame()
+    clustered = df[in_cluster]
+    
+    # Per-cluster statistics as bincounts over the cluster labels (0 to n_clusters - 1)
+    cluster_ids = labels[in_cluster]
+    n_clusters = int(cluster_ids.max()) + 1
+    fatal = clustered['_fatal'].to_numpy(dtype=bool)
+    severe = clustered['_severe'].to_numpy(dtype=bool)
+    light = clustered['_light'].to_numpy(dtype=bool)
+    bicycle = _flag(clustered, 'AccidentInvolvingBicycle')
+    
+    accident_count = np.bincount(cluster_ids, minlength=n_clusters)
+    blackspots_df = pd.DataFrame({
+        'cluster_id': np.arange(n_clusters),
+        'center_lat': np.bincount(cluster_ids, weights=clustered['latitude'].to_numpy(),
+                                  minlength=n_clusters) / accident_count,
+        'center_lon': np.bincount(cluster_ids, weights=clustered['longitude'].to_numpy(),
+                                  minlength=n_clusters) / accident_count,
+        'accident_count': accident_count,
+        'fatal_accidents': np.bincount(cluster_ids[fatal], minlength=n_clusters),
+        'severe_accidents': np.bincount(cluster_ids[severe], minlength=n_clusters),
+        'light_accidents': np.bincount(cluster_ids[light], minlength=n_clusters),
+        'bicycle_accidents': np.bincount(cluster_ids[bicycle], minlength=n_clusters),
+    })
+    
+    # Most common canton and accident type
+    blackspots_df['canton'] = _most_common_by_group(cluster_ids, clustered['CantonCode'], n_clusters)
+    if 'AccidentType_en' in clustered.columns:
+        blackspots_df['most_common_type'] = _most_common_by_group(
+            cluster_ids, clustered['AccidentType_en'], n_clusters)
+    else:
+        blackspots_df['most_common_type'] = 'Unknown'
     
-    for cluster_id in df['cluster'].unique():
-        if cluster_id == -1:
-            continue
-            
-        cluster_data = df[df['cluster'] == cluster_id]
-        
-        # Calculate cluster statistics
-        center_lat = cluster_data['latitude'].mean()
-        center_lon = cluster_data['longitude'].mean()
-        accident_count = len(cluster_data)
-        
-        # Severity breakdown
-        fatal_count = len(cluster_data[cluster_data['AccidentSeverityCategory'] == 'as1'])
-        severe_count = len(cluster_data[cluster_data['AccidentSeverityCategory'] == 'as2'])
-        light_count = len(cluster_data[cluster_data['AccidentSeverityCategory'] == 'as3'])
-        
-        # Bicycle involvement
-        bicycle_count = len(cluster_data[cluster_data['AccidentInvolvingBicycle'] == 'true'])
-        
-        # Most common canton
-        canton = cluster_data['CantonCode'].mode().iloc[0] if not cluster_data['CantonCode'].mode().empty else 'Unknown'
-        
-        # Most common accident type
-        accident_type = cluster_data['AccidentType_en'].mode().iloc[0] if 'AccidentType_en' in cluster_data.columns and not cluster_data['AccidentType_en'].mode().empty else 'Unknown'
-        
-        blackspots.append({
-            'cluster_id': cluster_id,
-            'center_lat': center_lat,
-            'center_lon': center_lon,
-            'accident_count': accident_count,
-            'fatal_accidents': fatal_count,
-            'severe_accidents': severe_count,
-            'light_accidents': light_count,
-            'bicycle_accidents': bicycle_count,
-            'canton': canton,
-            'most_common_type': accident_type,
-            'risk_score': fatal_count * 5 + severe_count * 3 + light_count * 1
-        })
-    
-    blackspots_df = pd.DataFrame(blackspots)
+    blackspots_df['risk_score'] = (blackspots_df['fatal_accidents'] * 5 +
+                                   blackspots_df['severe_accidents'] * 3 +
+                                   blackspots_df['light_accidents'])
     
     # Sort by risk score
     if not blackspots_df.empty:
@@ -410,50 +537,83 @@ def analyze_seasonal_patterns(df):
     Analyze seasonal patterns in accident data.
     
     Args:
-        df (pandas.DataFrame): Accident data
+        df (pandas.DataFrame): Accident data, preferably from prepare_dataset (missing
+                               derived columns are computed on each call)
         
     Returns:
         dict: Seasonal analysis results
     """
-    if df.empty or 'AccidentMonth' not in df.columns:
+    if df.empty:
+        return {}
+    df = _with_derived_columns(df)
+    if 'season' not in df.columns:
         return {}
     
     seasonal_stats = {}
     
-    # Define seasons (Northern Hemisphere)
-    seasons = {
-        'Winter': [12, 1, 2],
-        'Spring': [3, 4, 5],
-        'Summer': [6, 7, 8],
-        'Fall': [9, 10, 11]
-    }
-    
     # Count accidents by season
-    df['season'] = df['AccidentMonth'].apply(
-        lambda m: next((season for season, months in seasons.items() if m in months), 'Unknown')
-    )
-    
-    season_counts = df.groupby('season').size().to_dict()
+    season_counts = df.groupby('season', observed=True, sort=False).size().to_dict()
     seasonal_stats['accident_counts'] = season_counts
     
     # Severity by season
     if 'AccidentSeverityCategory_en' in df.columns:
-        severity_by_season = df.groupby(['season', 'AccidentSeverityCategory_en']).size().unstack(fill_value=0)
+        severity_by_season = df.groupby(['season', 'AccidentSeverityCategory_en'], observed=True, sort=False).size().unstack(fill_value=0)
         seasonal_stats['severity_by_season'] = severity_by_season.to_dict()
     
     # Bicycle accidents by season
     if 'AccidentInvolvingBicycle' in df.columns:
-        bicycle_seasonal = df[df['AccidentInvolvingBicycle'] == 'true'].groupby('season').size().to_dict()
+        bicycle_seasons = df['season'][_flag(df, 'AccidentInvolvingBicycle')]
+        bicycle_seasonal = bicycle_seasons.groupby(bicycle_seasons, observed=True, sort=False).size().to_dict()
         seasonal_stats['bicycle_by_season'] = bicycle_seasonal
     
     return seasonal_stats
 
+TREND_METRICS = ['total', 'fatal', 'bicycle', 'pedestrian']
+
+def year_month_counts(df):
+    """
+    Count accidents per year, month and trend metric into one dense array.
+    
+    Args:
+        df (pandas.DataFrame): Accident data, preferably from prepare_dataset (missing
+                               derived columns are computed on each call)
+        
+    Returns:
+        tuple: (years, counts) where counts[i, m, k] is the number of
+               TREND_METRICS[k] accidents in years[i] and month m
+               (m = 0 collects rows with a missing month)
+    """
+    df = _with_derived_columns(df)
+    years = df['AccidentYear'].to_numpy(dtype=np.float64)
+    months = df['AccidentMonth'].to_numpy(dtype=np.float64)
+    has_year = ~np.isnan(years)
+    months = months[has_year]
+    months = np.where((months >= 1) & (months <= 12), months, 0).astype(np.int64)
+    unique_years, year_index = np.unique(years[has_year].astype(np.int64), return_inverse=True)
+    
+    # Flat (year, month) cell of every row; one bincount per metric fills the array
+    cells = year_index * 13 + months
+    n_cells = len(unique_years) * 13
+    metric_masks = [
+        None,
+        df['_fatal'].to_numpy(dtype=bool)[has_year],
+        _flag(df, 'AccidentInvolvingBicycle')[has_year],
+        _flag(df, 'AccidentInvolvingPedestrian')[has_year],
+    ]
+    counts = np.empty((len(unique_years), 13, len(TREND_METRICS)), dtype=np.int64)
+    for k, metric_mask in enumerate(metric_masks):
+        metric_cells = cells if metric_mask is None else cells[metric_mask]
+        counts[:, :, k] = np.bincount(metric_cells, minlength=n_cells).reshape(-1, 13)
+    
+    return unique_years, counts
+
 def calculate_year_over_year_trends(df):
     """
     Calculate year-over-year trends in accident data.
     
     Args:
-        df (pandas.DataFrame): Accident data
+        df (pandas.DataFrame): Accident data, preferably from prepare_dataset (missing
+                               derived columns are computed on each call)
         
     Returns:
         dict: Year-over-year trend analysis
@@ -463,8 +623,10 @@ def calculate_year_over_year_trends(df):
     
     trends = {}
     
-    # Overall yearly trend
-    yearly_counts = df.groupby('AccidentYear').size().sort_index()
+    # Yearly totals per metric are sums over the month axis of the year-month counts
+    years, counts = year_month_counts(df)
+    yearly = pd.DataFrame(counts.sum(axis=1), index=years, columns=TREND_METRICS)
+    yearly_counts = yearly['total']
     trends['yearly_counts'] = yearly_counts.to_dict()
     
     # Calculate percentage change
@@ -473,17 +635,45 @@ def calculate_year_over_year_trends(df):
         trends['yearly_pct_change'] = pct_changes.to_dict()
     
     # Bicycle trends
-    if 'AccidentInvolvingBicycle' in df.columns:
-        bicycle_yearly = df[df['AccidentInvolvingBicycle'] == 'true'].groupby('AccidentYear').size().sort_index()
-        trends['bicycle_yearly'] = bicycle_yearly.to_dict()
+    bicycle_yearly = yearly['bicycle']
+    trends['bicycle_yearly'] = bicycle_yearly[bicycle_yearly > 0].to_dict()
     
     # Severity trends
-    if 'AccidentSeverityCategory' in df.columns:
-        fatal_yearly = df[df['AccidentSeverityCategory'] == 'as1'].groupby('AccidentYear').size().sort_index()
-        trends['fatal_yearly'] = fatal_yearly.to_dict()
+    fatal_yearly = yearly['fatal']
+    trends['fatal_yearly'] = fatal_yearly[fatal_yearly > 0].to_dict()
     
     return trends
 
+def _value_codes(series):
+    # Integer codes (-1 = missing) and sorted unique values; categoricals reuse their codes
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64), series.cat.categories
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), uniques
+
+def _top_combinations(df, columns, n=10):
+    # The n most frequent value combinations of columns as records with a 'count' field.
+    # Combinations are counted with one bincount over a dense grid of value codes; ties
+    # keep grid (= sorted group) order, like groupby(...).size().nlargest(n).
+    coded = [_value_codes(df[col]) for col in columns]
+    cells = np.zeros(len(df), dtype=np.int64)
+    valid = np.ones(len(df), dtype=bool)
+    for codes, uniques in coded:
+        cells = cells * len(uniques) + codes
+        valid &= codes >= 0
+    
+    shape = [len(uniques) for _, uniques in coded]
+    counts = np.bincount(cells[valid], minlength=int(np.prod(shape)))
+    top = np.argsort(-counts, kind='stable')[:n]
+    top = top[counts[top] > 0]
+    
+    # Unravel the winning cells back into one value per column
+    top_values = np.unravel_index(top, shape)
+    result = {col: uniques[value_index].tolist()
+              for col, (_, uniques), value_index in zip(columns, coded, top_values)}
+    result['count'] = counts[top].tolist()
+    return pd.DataFrame(result).to_dict('records')
+
 def generate_risk_predictions(df):
     """
     Generate predictive insights for high-risk time/location combinations.
@@ -502,29 +692,26 @@ def generate_risk_predictions(df):
     # High-risk time/location combinations
     if all(col in df.columns for col in ['AccidentHour', 'CantonCode', 'AccidentWeekDay_en']):
         # Find most dangerous hour/canton combinations
-        hour_canton = df.groupby(['AccidentHour', 'CantonCode']).size().reset_index(name='count')
-        hour_canton = hour_canton.sort_values('count', ascending=False).head(10)
-        predictions['hour_canton_risks'] = hour_canton.to_dict('records')
+        predictions['hour_canton_risks'] = _top_combinations(df, ['AccidentHour', 'CantonCode'])
         
         # Find most dangerous day/hour combinations
-        day_hour = df.groupby(['AccidentWeekDay_en', 'AccidentHour']).size().reset_index(name='count')
-        day_hour = day_hour.sort_values('count', ascending=False).head(10)
-        predictions['day_hour_risks'] = day_hour.to_dict('records')
+        predictions['day_hour_risks'] = _top_combinations(df, ['AccidentWeekDay_en', 'AccidentHour'])
     
     # Bicycle-specific risk predictions
-    if 'AccidentInvolvingBicycle' in df.columns:
-        bicycle_df = df[df['AccidentInvolvingBicycle'] == 'true']
+    if 'AccidentInvolvingBicycle' in df.columns and all(col in df.columns for col in ['AccidentHour', 'RoadType_en', 'CantonCode']):
+        bicycle_mask = _flag(df, 'AccidentInvolvingBicycle')
         
-        if not bicycle_df.empty and all(col in bicycle_df.columns for col in ['AccidentHour', 'RoadType_en', 'CantonCode']):
+        if bicycle_mask.any():
+            # Only the grouping columns are materialized for the bicycle subset
+            bicycle_df = df.loc[bicycle_mask,
+                                ['AccidentHour', 'RoadType_en', 'CantonCode', 'AccidentSeverityCategory']]
+            
             # High-risk hour/road combinations for cyclists
-            bike_hour_road = bicycle_df.groupby(['AccidentHour', 'RoadType_en']).size().reset_index(name='count')
-            bike_hour_road = bike_hour_road.sort_values('count', ascending=False).head(10)
-            predictions['bicycle_hour_road_risks'] = bike_hour_road.to_dict('records')
+            predictions['bicycle_hour_road_risks'] = _top_combinations(bicycle_df, ['AccidentHour', 'RoadType_en'])
             
             # High-risk cantons for cyclists
-            bike_canton_severity = bicycle_df.groupby(['CantonCode', 'AccidentSeverityCategory']).size().reset_index(name='count')
-            bike_canton_severity = bike_canton_severity.sort_values('count', ascending=False).head(10)
-            predictions['bicycle_canton_severity'] = bike_canton_severity.to_dict('records')
+            predictions['bicycle_canton_severity'] = _top_combinations(
+                bicycle_df, ['CantonCode', 'AccidentSeverityCategory'])
     
     # Generate route planning recommendations
     recommendations = []
@@ -546,32 +733,74 @@ def calculate_monthly_trends(df, metric_type='total'):
     Calculate monthly trends for sparkline visualization.
     
     Args:
-        df (pandas.DataFrame): Accident data
+        df (pandas.DataFrame): Accident data, preferably from prepare_dataset (missing
+                               derived columns are computed on each call)
         metric_type (str): Type of metric - 'total', 'fatal', 'bicycle', 'pedestrian'
         
     Returns:
         dict: Monthly counts, current month value, previous month value, and delta
     """
-    if df.empty or 'AccidentYear' not in df.columns or 'AccidentMonth' not in df.columns:
+    if df.empty:
+        return None
+    df = _with_derived_columns(df)
+    if '_year_month' not in df.columns:
         return None
     
-    # Filter based on metric type
+    # Filter based on metric type (only the year-month key is needed)
+    year_month = df['_year_month'].to_numpy()
     if metric_type == 'fatal':
-        filtered_df = df[df['AccidentSeverityCategory'] == 'as1']
+        metric_mask = df['_fatal'].to_numpy(dtype=bool)
     elif metric_type == 'bicycle':
-        filtered_df = df[df['AccidentInvolvingBicycle'] == 'true']
+        metric_mask = _flag(df, 'AccidentInvolvingBicycle')
     elif metric_type == 'pedestrian':
-        filtered_df = df[df['AccidentInvolvingPedestrian'] == 'true']
+        metric_mask = _flag(df, 'AccidentInvolvingPedestrian')
     else:
-        filtered_df = df
+        metric_mask = None
+    
+    if metric_mask is not None:
+        if not metric_mask.any():
+            return None
+        year_month = year_month[metric_mask]
+    
+    # Group by the integer year*100 + month key (rows missing either part are skipped)
+    year_month = year_month[year_month >= 0]
+    monthly_counts = pd.Series(year_month).groupby(year_month, sort=False).size().sort_index()
+    
+    return _monthly_trend_summary(monthly_counts)
+
+def calculate_all_monthly_trends(df):
+    """
+    Calculate the monthly trends of every metric type from one set of year-month counts.
+    
+    Args:
+        df (pandas.DataFrame): Accident data, preferably from prepare_dataset (missing
+                               derived columns are computed on each call)
+        
+    Returns:
+        dict: calculate_monthly_trends result for each of 'total', 'fatal',
+              'bicycle' and 'pedestrian'
+    """
+    trends = dict.fromkeys(TREND_METRICS)
+    if df.empty:
+        return trends
+    df = _with_derived_columns(df)
+    if '_year_month' not in df.columns:
+        return trends
     
-    # Create year-month combination for grouping
-    filtered_df = filtered_df.copy()
-    filtered_df['year_month'] = filtered_df['AccidentYear'].astype(str) + '-' + filtered_df['AccidentMonth'].astype(str).str.zfill(2)
+    # Monthly series are read off the year-month counts (rows missing a month are skipped)
+    years, counts = year_month_counts(df)
+    keys = (years[:, None] * 100 + np.arange(1, 13)).ravel()
+    monthly = counts[:, 1:, :].reshape(-1, len(TREND_METRICS))
     
-    # Group by year-month
-    monthly_counts = filtered_df.groupby('year_month').size().sort_index()
+    for k, metric_type in enumerate(TREND_METRICS):
+        # Like the per-metric path, only months with at least one such accident count
+        present = monthly[:, k] > 0
+        trends[metric_type] = _monthly_trend_summary(pd.Series(monthly[present, k], index=keys[present]))
     
+    return trends
+
+def _monthly_trend_summary(monthly_counts):
+    # Sparkline values, labels and month-over-month delta from counts sorted by year-month key
     if len(monthly_counts) == 0:
         return None
     
@@ -585,7 +814,7 @@ def calculate_monthly_trends(df, metric_type='total'):
     
     return {
         'monthly_values': monthly_counts.values.tolist(),
-        'monthly_labels': monthly_counts.index.tolist(),
+        'monthly_labels': [f"{key // 100}-{key % 100:02d}" for key in monthly_counts.index],
         'current_value': int(current_month),
         'previous_value': int(previous_month),
         'delta': int(delta),
@@ -1,19 +1,22 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import folium
-from streamlit_folium import st_folium
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.io as pio
+import hashlib
+import io
 import json
 import numpy as np
-from data_loader import load_accident_data
+from data_loader import load_accident_data, DASHBOARD_COLUMNS, DAY_ORDER, WEEKDAY_DTYPE
 from map_utils import (create_base_map, add_accident_markers, create_heatmap, create_blackspot_map, 
                        add_routing_control, add_geocoding_search, add_custom_osm_layers, fit_map_to_df)
-from analytics import (calculate_summary_stats, create_temporal_analysis, filter_data,
+from analytics import (prepare_dataset, calculate_summary_stats, create_temporal_analysis, filter_data,
                        identify_blackspot_zones, analyze_seasonal_patterns, 
-                       calculate_year_over_year_trends, generate_risk_predictions, calculate_monthly_trends)
+                       calculate_year_over_year_trends, generate_risk_predictions, calculate_all_monthly_trends,
+                       value_counts_observed)
 from pathlib import Path
 
 # Resolve data file robustly (works locally and on Streamlit Cloud)
@@ -28,6 +31,48 @@ def resolve_data_file():
             return str(p)
     return None
 
+# Static footer content (credits, then the data disclaimer)
+CREDITS_MD = """
+            Created by @Giovanni Lopez 🚴‍♂️ while attending the 2025 Cycling HACK in Zürich
+            Using Streamlit 🚀 Magic, GNU GENERAL PUBLIC LICENSE Version 3, 29 June 2007
+            - Event Page: 
+                - https://cyclinghack.ch/events/zurich-2025/
+            - Dataset opendata.swiss:
+                - https://opendata.swiss/en/dataset/polizeilich-registrierte-verkehrsunfalle-auf-dem-stadtgebiet-zurich-seit-2011
+                - https://opendata.swiss/en/dataset/polizeilich-registrierte-verkehrsunfalle-auf-dem-stadtgebiet-zurich-seit-2011/resource/d2ba4c0b-3428-47a2-b19d-d6fb2a86814d
+            - Who am I?:
+                - https://www.linkedin.com/in/giovlopez/
+                - https://www.instagram.com/giobcflowy/ 
+            - Explore more projects:
+                - https://bikeflow.ch
+                - https://mapaqua.ch/ (Native App for iOS and Android in development 🙂)
+                - https://makinita.ch
+
+            Buy me a coffee ☕: https://buymeacoffee.com/bikeflow
+            ,or a two ☕☕: https://www.paypal.com/ncp/payment/CJVK8M6HLW3C2
+"""
+
+DISCLAIMER_HTML = """
+    <div style='background-color: #f0f2f6; padding: 20px; border-radius: 5px; margin-top: 20px;'>
+    <h4 style='margin-top: 0;'>⚠️ Data Disclaimer</h4>
+    <p style='font-size: 14px; line-height: 1.6;'>
+    This dashboard and its visualizations have been created with the best intentions to provide insights into Swiss road traffic accidents. 
+    While reasonable checks and validations have been performed on the data and analysis, the information presented may contain errors, 
+    inaccuracies, or incomplete representations.
+    </p>
+    <p style='font-size: 14px; line-height: 1.6;'>
+    <strong>Important:</strong> Before making any decisions, implementing safety measures, or taking actions based on the information 
+    provided in this dashboard, users must conduct comprehensive verification, testing, and validation of the data and findings. 
+    This tool is intended for informational and analytical purposes only and should not be the sole basis for critical decisions 
+    related to road safety, urban planning, or policy making.
+    </p>
+    <p style='font-size: 14px; line-height: 1.6; margin-bottom: 0;'>
+    The creators and maintainers of this dashboard assume no liability for any decisions made or actions taken based on the 
+    information presented herein.
+    </p>
+    </div>
+    """
+
 # Set Plotly default template
 pio.renderers.default = "browser"
 pio.templates.default = "plotly_white"
@@ -48,22 +93,369 @@ This dashboard provides comprehensive insights into road traffic accidents acros
 with special focus on cyclist safety and risk analysis.
 """)
 
-# Load data
-@st.cache_data
+# Load data (cache_resource: every rerun and session shares the one read-only frame
+# instead of unpickling a copy of it). The file's mtime is part of the key, so an
+# updated data file is reloaded; max_entries drops the frame it replaces.
+@st.cache_resource(max_entries=1)
+def load_prepared_data(file_path, mtime):
+    return prepare_dataset(load_accident_data(file_path, use_object_storage=False,
+                                              columns=DASHBOARD_COLUMNS))
+
 def get_accident_data():
+    # Returns the frame and its dataset version, (file_path, mtime), which goes into
+    # filter_key so the downstream caches also drop results from a replaced file
     file_path = resolve_data_file()
     if not file_path:
         st.error(f"Data file not found in {DATA_DIR}. "
                  f"Found: {[p.name for p in DATA_DIR.glob('*')] if DATA_DIR.exists() else 'no folder'}")
         st.stop()
-    return load_accident_data(file_path, use_object_storage=False)
+    data_version = (file_path, Path(file_path).stat().st_mtime)
+    return load_prepared_data(*data_version), data_version
 
 
 def make_csv_bytes(df, cols):
-    return df[cols].to_csv(index=False).encode("utf-8")
+    # Write the encoded CSV straight into a byte buffer (no intermediate str copy)
+    buffer = io.BytesIO()
+    df[cols].to_csv(buffer, index=False, encoding="utf-8")
+    return buffer.getvalue()
+
+def make_parquet_bytes(df, cols):
+    # Flags stay bool and label columns stay dictionary-encoded in the Parquet file
+    buffer = io.BytesIO()
+    df[cols].to_parquet(buffer, compression='zstd', index=False)
+    return buffer.getvalue()
+
+def sparkline_values(values, max_points=12):
+    # Evenly thin a long monthly series for the metric sparklines, keeping the latest month
+    step = -(-len(values) // max_points)
+    return values[(len(values) - 1) % step::step]
+
+# Layout shared by the four metric sparklines; built once and reused by every figure
+SPARKLINE_LAYOUT = go.Layout(
+    height=60,
+    margin=dict(l=0, r=0, t=0, b=0),
+    xaxis=dict(visible=False),
+    yaxis=dict(visible=False),
+    showlegend=False,
+    hovermode=False,
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)'
+)
+
+def sparkline_figure(values, color, fillcolor):
+    return go.Figure(
+        data=[go.Scatter(
+            y=sparkline_values(values),
+            mode='lines',
+            hoverinfo='skip',
+            line=dict(color=color, width=2),
+            fill='tozeroy',
+            fillcolor=fillcolor
+        )],
+        layout=SPARKLINE_LAYOUT
+    )
+
+# The filtered frame is shared read-only between reruns; cache_resource hands back the
+# same object instead of unpickling a copy of it every time.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def get_filtered_data(_df, filter_key):
+    (data_version, years, severities, accident_types, road_types, cantons,
+     parties, party_mode, months, hour_range) = filter_key
+    return filter_data(_df, list(years), list(severities), list(accident_types), list(road_types),
+                       list(cantons), list(parties), party_mode, list(months), hour_range)
+
+def int_counts_frame(counts, col):
+    # Counts keyed by an integer column as a plotting frame with columns col and 'count'
+    return pd.DataFrame({col: counts.index.to_numpy(dtype=int), 'count': counts.to_numpy()})
+
+def weekday_counts_frame(counts):
+    # Weekday counts as a plotting frame (AccidentWeekDay_en, count), Monday first
+    counts = counts.set_axis(counts.index.astype(WEEKDAY_DTYPE)).sort_index()
+    return pd.DataFrame({'AccidentWeekDay_en': counts.index.astype(str), 'count': counts.to_numpy()})
+
+def weekday_hour_grid(df):
+    # Accidents per weekday (rows, Monday first) and hour (columns 0-23) from one bincount
+    weekdays = df['AccidentWeekDay_en'].astype(WEEKDAY_DTYPE).cat.codes.to_numpy(dtype=np.int64)
+    hours = df['AccidentHour'].to_numpy(dtype=np.float64)
+    valid = (weekdays >= 0) & (hours >= 0) & (hours <= 23)
+    cells = weekdays[valid] * 24 + hours[valid].astype(np.int64)
+    grid = np.bincount(cells, minlength=len(DAY_ORDER) * 24).reshape(len(DAY_ORDER), 24)
+    return pd.DataFrame(grid, index=DAY_ORDER, columns=range(24))
+
+# Analytics results cached per filter selection. Frame arguments are underscore-prefixed
+# so Streamlit keys the cache on filter_key (the dataset version and the sidebar values)
+# instead of hashing the whole frame on every rerun. Like get_filtered_data, each keeps
+# the results of the last 32 selections.
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_distributions(_filtered_df, filter_key):
+    # Counts behind the Analytics and Temporal Patterns charts
+    return {
+        'severity': value_counts_observed(_filtered_df['AccidentSeverityCategory_en']),
+        'types': value_counts_observed(_filtered_df['AccidentType_en']).head(10),
+        'road': value_counts_observed(_filtered_df['RoadType_en']),
+        'canton': value_counts_observed(_filtered_df['CantonCode']).head(10),
+        'monthly': value_counts_observed(_filtered_df['AccidentMonth']).sort_index(),
+        'hourly': value_counts_observed(_filtered_df['AccidentHour']).sort_index(),
+        'weekday': value_counts_observed(_filtered_df['AccidentWeekDay_en']).sort_index(),
+        'weekday_hour': weekday_hour_grid(_filtered_df),
+    }
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_monthly_trends(_filtered_df, filter_key):
+    return calculate_all_monthly_trends(_filtered_df)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_seasonal_patterns(_filtered_df, filter_key):
+    return analyze_seasonal_patterns(_filtered_df)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_year_over_year_trends(_filtered_df, filter_key):
+    return calculate_year_over_year_trends(_filtered_df)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_risk_predictions(_filtered_df, filter_key):
+    return generate_risk_predictions(_filtered_df)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_bicycle_summary(_filtered_df, filter_key):
+    # Most frequent hour, weekday and road type of the bicycle accidents (None if unknown)
+    # One slice of just the three columns involved (the full bicycle frame is never built)
+    bicycle_df = _filtered_df.loc[_filtered_df['AccidentInvolvingBicycle'],
+                                  ['AccidentHour', 'AccidentWeekDay_en', 'RoadType_en']]
+    
+    # Peak hour from an hour-of-day histogram (earliest on ties, as with mode())
+    hours = bicycle_df['AccidentHour'].dropna().to_numpy(dtype=np.int64)
+    peak_hour = int(np.bincount(hours).argmax()) if len(hours) else None
+    summary = {
+        'peak_hour': peak_hour,
+        'peak_hour_range': f"{peak_hour}:00-{peak_hour + 1}:00" if peak_hour is not None else "N/A",
+    }
+    # Weekday and road type from a bincount over the category codes (smallest on ties,
+    # as with mode(), which would also collect every tied value)
+    for key, col in [('peak_day', 'AccidentWeekDay_en'), ('dangerous_road', 'RoadType_en')]:
+        values = pd.Categorical(bicycle_df[col])
+        codes = values.codes[values.codes >= 0]
+        summary[key] = values.categories[np.bincount(codes).argmax()] if len(codes) else None
+    return summary
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_party_severity(_filtered_df, filter_key):
+    # Severity counts of the accidents involving each party, masking only the severity column
+    severity = _filtered_df['AccidentSeverityCategory_en']
+    return {col: value_counts_observed(severity[_filtered_df[col].to_numpy()])
+            for col in ['AccidentInvolvingBicycle', 'AccidentInvolvingPedestrian',
+                        'AccidentInvolvingMotorcycle']}
+
+# Also keyed on the clustering sliders, so it holds fewer entries (like the map caches)
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_blackspot_zones(_df, filter_key, subset, eps_km, min_samples):
+    return identify_blackspot_zones(_df, eps_km=eps_km, min_samples=min_samples)
+
+# Columns offered in the data table, and the ones shown by default
+DATA_TABLE_COLUMNS = ('AccidentUID', 'AccidentType_en', 'AccidentSeverityCategory_en',
+                      'RoadType_en', 'CantonCode', 'AccidentYear', 'AccidentMonth_en',
+                      'AccidentWeekDay_en', 'AccidentHour_text', 'AccidentInvolvingBicycle',
+                      'AccidentInvolvingPedestrian', 'AccidentInvolvingMotorcycle')
+DATA_TABLE_DEFAULT_COLUMNS = ('AccidentType_en', 'AccidentSeverityCategory_en', 'CantonCode',
+                              'AccidentYear', 'AccidentInvolvingBicycle')
+
+# The data table and its CSV are rebuilt only when the filters or the chosen columns
+# change, not every time the tab reruns.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_data_table(_filtered_df, filter_key, columns):
+    display_df = _filtered_df[list(columns)]
+
+    # Format boolean columns as two-category ✗/✓ labels: the bools become the codes
+    # directly (assign builds the new frame, so no defensive copy is needed)
+    flag_cols = [col for col in ['AccidentInvolvingBicycle', 'AccidentInvolvingPedestrian',
+                                 'AccidentInvolvingMotorcycle'] if col in display_df.columns]
+    return display_df.assign(**{col: pd.Categorical.from_codes(display_df[col].to_numpy(dtype=np.int8),
+                                                               categories=['✗', '✓'])
+                                for col in flag_cols})
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_data_table_csv(_filtered_df, filter_key, columns):
+    return make_csv_bytes(get_data_table(_filtered_df, filter_key, columns), list(columns))
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_data_table_parquet(_filtered_df, filter_key, columns):
+    return make_parquet_bytes(_filtered_df, list(columns))
+
+# Dashboard views, picked with a segmented control above the content
+VIEWS = ["🗺️ Map View", "📊 Analytics", "⏰ Temporal Patterns", "🔥 Hotspots", "🚴 Cyclist Safety", "📋 Data Table"]
+
+# Up to this many accidents the Map View shows markers (clustered in the browser above
+# MARKER_CLUSTER_THRESHOLD); larger selections fall back to the heatmap
+MAP_MARKER_LIMIT = 10000
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_map_html(_filtered_df, filter_key, use_heatmap, show_markers):
+    if use_heatmap:
+        m = create_heatmap(_filtered_df)  # uses slim create_base_map()
+    else:
+        m = create_base_map()
+        if show_markers:
+            m = add_accident_markers(m, _filtered_df, max_markers=MAP_MARKER_LIMIT)
+
+    # Always zoom to current filtered data
+    m = fit_map_to_df(m, _filtered_df, lat_col="Latitude", lon_col="Longitude", pad_deg=0.01)
+    return m.get_root().render()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_blackspot_map_html(_blackspots_df, filter_key, subset, eps_km, min_samples, basemap_style):
+    # Keyed like cached_blackspot_zones, whose result _blackspots_df is
+    return create_blackspot_map(_blackspots_df, basemap_style=basemap_style).get_root().render()
+
+# Blackspot table columns in display order, with their labels
+BLACKSPOT_TABLE_LABELS = {'canton': 'Canton', 'accident_count': 'Total', 'fatal_accidents': 'Fatal',
+                          'severe_accidents': 'Severe', 'bicycle_accidents': 'Bicycle',
+                          'most_common_type': 'Common Type', 'risk_score': 'Risk Score'}
+
+# Tabs with their own widgets run as fragments: changing one of those widgets
+# reruns just that tab instead of the whole dashboard.
+@st.fragment
+def render_map_tab(filtered_df, filter_key):
+    st.subheader("Accident Locations Across Switzerland", 
+                 help="""Interactive map showing accident locations with options for heatmap and individual markers. 
+                         Reduce filters to see individual markers if too many accidents are present.
+                         Click on markers for detailed info.
+                 """)
+
+    col1, col2 = st.columns([3, 1])
+
+    with col2:
+        map_style = st.selectbox("Map View", ["Normal", "Heatmap"], key="map_style")
+        show_markers = st.checkbox("Show Individual Markers", 
+                                   value=True,
+                                   help="Colors markers by severity. Disable to see heatmap only.",
+                                )
+
+    with col1:
+        use_heatmap = map_style == "Heatmap" or len(filtered_df) > MAP_MARKER_LIMIT
+        if map_style != "Heatmap" and len(filtered_df) > MAP_MARKER_LIMIT:
+            st.info(
+                f"Showing heatmap view due to large number of accidents ({len(filtered_df)}). "
+                "Uncheck some filters to see individual markers."
+            )
+
+        # Display-only map: the rendered HTML is cached, so reruns with the same
+        # filters and view options skip building and serializing the folium map
+        map_html = cached_map_html(filtered_df, filter_key, use_heatmap, show_markers and not use_heatmap)
+        components.html(map_html, height=500)
+
+@st.fragment
+def render_hotspots_tab(filtered_df, filter_key):
+    st.subheader("🔥 Accident Hotspots & Blackspot Zones")
+
+    # Clustering parameters
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col2:
+        cluster_distance = st.slider("Cluster Distance (km)", 0.1, 2.0, 0.5, 0.1)
+    with col3:
+        min_accidents = st.slider("Min Accidents per Zone", 3, 15, 5, 1)
+
+    # Identify blackspot zones using DBSCAN clustering
+    blackspots_df = cached_blackspot_zones(filtered_df, filter_key, 'all', cluster_distance, min_accidents)
+
+    # Display map with blackspot
+    st.write("**Identified Blackspot Zones**")
+    if not blackspots_df.empty:
+        components.html(cached_blackspot_map_html(blackspots_df, filter_key, 'all', cluster_distance,
+                                                  min_accidents, 'opensreetmap'), height=400)
+    else:
+        st.info("No blackspot zones identified with current parameters. Try adjusting the cluster distance or minimum accidents.")
+
+    # Display blackspot statistics
+    if not blackspots_df.empty:
+        st.subheader("Top 10 Blackspot Zones")
+
+        # st.dataframe picks and relabels the columns, so the frame is passed as is
+        st.dataframe(blackspots_df.head(10), width='stretch',
+                     column_order=list(BLACKSPOT_TABLE_LABELS), column_config=BLACKSPOT_TABLE_LABELS)
+
+    # Risk factors analysis
+    st.subheader("Risk Factor Analysis")
+    party_severity = cached_party_severity(filtered_df, filter_key)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.write("**🚴‍♂️ Cyclist Risk Factors:**")
+        bike_severity = party_severity['AccidentInvolvingBicycle']
+        if not bike_severity.empty:
+            for severity, count in bike_severity.items():
+                st.write(f"• {severity}: {count}")
+        else:
+            st.write("No bicycle accidents in filtered data")
+
+    with col2:
+        st.write("**🚶‍♂️ Pedestrian Risk Factors:**")
+        ped_severity = party_severity['AccidentInvolvingPedestrian']
+        if not ped_severity.empty:
+            for severity, count in ped_severity.items():
+                st.write(f"• {severity}: {count}")
+        else:
+            st.write("No pedestrian accidents in filtered data")
+
+    with col3:
+        st.write("**🏍️ Motorcycle Risk Factors:**")
+        moto_severity = party_severity['AccidentInvolvingMotorcycle']
+        if not moto_severity.empty:
+            for severity, count in moto_severity.items():
+                st.write(f"• {severity}: {count}")
+        else:
+            st.write("No motorcycle accidents in filtered data")
+
+@st.fragment
+def render_data_table_tab(filtered_df, filter_key):
+    st.subheader("📋 Detailed Accident Data")
+
+    # Display options
+    col1, col2 = st.columns([3, 1])
+
+    with col2:
+        show_columns = st.multiselect(
+            "Select Columns to Display",
+            options=DATA_TABLE_COLUMNS,
+            default=list(DATA_TABLE_DEFAULT_COLUMNS)
+        )
+
+    with col1:
+        if show_columns:
+            display_df = get_data_table(filtered_df, filter_key, tuple(show_columns))
+            st.dataframe(display_df, width='stretch', height=400)
+
+            # --- robust download: bytes + stable key ---
+            # The files are only serialized once the user asks for them
+            if display_df.empty:
+                st.info("No rows to download with current filters.")
+            elif st.checkbox("Prepare download files", key="prepare_downloads",
+                             help="Builds CSV and Parquet files of the table for download."):
+                csv_bytes = cached_data_table_csv(filtered_df, filter_key, tuple(show_columns))
+                # make the key stable across re-runs; tie it to columns+rowcount, not transient ids
+                # (the columns go in as a short fixed-width digest)
+                columns_digest = hashlib.blake2b('|'.join(show_columns).encode(), digest_size=8).hexdigest()
+                dl_key = f"dl_csv_{columns_digest}_{len(display_df)}"
+                st.download_button(
+                    label="Download filtered data as CSV",
+                    data=csv_bytes,
+                    file_name="swiss_accidents_filtered.csv",
+                    mime="text/csv",
+                    key=dl_key,
+                )
+                st.download_button(
+                    label="Download filtered data as Parquet",
+                    data=cached_data_table_parquet(filtered_df, filter_key, tuple(show_columns)),
+                    file_name="swiss_accidents_filtered.parquet",
+                    mime="application/octet-stream",
+                    key=f"dl_parquet_{columns_digest}_{len(display_df)}",
+                )
+        else:
+            st.info("Please select columns to display")
+
 
 try:
-    df = get_accident_data()
+    df, data_version = get_accident_data()
     
     if df.empty:
         st.error("No accident data available.")
@@ -160,31 +552,35 @@ try:
         (0, 23)
     )
     
+    # Identifies the current dataset and filter selection in the data and analytics caches;
+    # multiselect values are sorted so picking the same values in another order reuses the entries
+    filter_key = (data_version, tuple(sorted(selected_years)), tuple(sorted(selected_severities)),
+                  tuple(sorted(selected_accident_types)), tuple(sorted(selected_road_types)),
+                  tuple(sorted(selected_cantons)), tuple(sorted(selected_parties)),
+                  party_mode, tuple(sorted(selected_months)), tuple(selected_hours))
+    
     # Apply filters
-    filtered_df = filter_data(
-        df, 
-        selected_years,
-        selected_severities,
-        selected_accident_types,
-        selected_road_types,
-        selected_cantons,
-        selected_parties,     
-        party_mode,           
-        selected_months,
-        selected_hours
-    )
+    filtered_df = get_filtered_data(df, filter_key)
     
     if filtered_df.empty:
         st.warning("No data matches the selected filters.")
         st.stop()
     
+    distributions = cached_distributions(filtered_df, filter_key)
+    
+    # Sparkline series for all four metric tiles, from one grouped pass
+    monthly_trends = cached_monthly_trends(filtered_df, filter_key)
+    
+    # Metric tile counts, summed over the indicator columns in one pass
+    tile_counts = filtered_df[['_fatal', 'AccidentInvolvingBicycle', 'AccidentInvolvingPedestrian']].sum()
+    
     # Main content
     # Summary statistics
     col1, col2, col3, col4 = st.columns(4)
     st.caption("📊 Sparklines show accident trends by month. ▲/▼ Delta shows change vs. previous month.")
     
     with col1:
-        total_trend = calculate_monthly_trends(filtered_df, 'total')
+        total_trend = monthly_trends['total']
         if total_trend:
             st.metric(
                 "Total Accidents", 
@@ -193,22 +589,8 @@ try:
                 delta_color="inverse"
             )
             # Sparkline
-            fig_spark = go.Figure()
-            fig_spark.add_trace(go.Scatter(
-                y=total_trend['monthly_values'],
-                mode='lines',
-                line=dict(color='#1f77b4', width=2),
-                fill='tozeroy',
-                fillcolor='rgba(31, 119, 180, 0.2)'
-            ))
-            fig_spark.update_layout(
-                height=60,
-                margin=dict(l=0, r=0, t=0, b=0),
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                showlegend=False,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)'
+            fig_spark = sparkline_figure(
+                total_trend['monthly_values'], '#1f77b4', 'rgba(31, 119, 180, 0.2)'
             )
             config = {"displayModeBar": False}
             st.plotly_chart(
@@ -221,8 +603,8 @@ try:
             st.metric("Total Accidents", len(filtered_df))
     
     with col2:
-        fatal_accidents = len(filtered_df[filtered_df['AccidentSeverityCategory'] == 'as1'])
-        fatal_trend = calculate_monthly_trends(filtered_df, 'fatal')
+        fatal_accidents = int(tile_counts['_fatal'])
+        fatal_trend = monthly_trends['fatal']
         if fatal_trend:
             st.metric(
                 "Fatal Accidents", 
@@ -231,22 +613,8 @@ try:
                 delta_color="inverse"
             )
             # Sparkline
-            fig_spark = go.Figure()
-            fig_spark.add_trace(go.Scatter(
-                y=fatal_trend['monthly_values'],
-                mode='lines',
-                line=dict(color='#d62728', width=2),
-                fill='tozeroy',
-                fillcolor='rgba(214, 39, 40, 0.2)'
-            ))
-            fig_spark.update_layout(
-                height=60,
-                margin=dict(l=0, r=0, t=0, b=0),
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                showlegend=False,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)'
+            fig_spark = sparkline_figure(
+                fatal_trend['monthly_values'], '#d62728', 'rgba(214, 39, 40, 0.2)'
             )
             config = {"displayModeBar": False}
             st.plotly_chart(
@@ -258,8 +626,8 @@ try:
             st.metric("Fatal Accidents", fatal_accidents)
     
     with col3:
-        bicycle_accidents = len(filtered_df[filtered_df['AccidentInvolvingBicycle'] == 'true'])
-        bicycle_trend = calculate_monthly_trends(filtered_df, 'bicycle')
+        bicycle_accidents = int(tile_counts['AccidentInvolvingBicycle'])
+        bicycle_trend = monthly_trends['bicycle']
         if bicycle_trend:
             st.metric(
                 "Bicycle Accidents", 
@@ -268,22 +636,8 @@ try:
                 delta_color="inverse"
             )
             # Sparkline
-            fig_spark = go.Figure()
-            fig_spark.add_trace(go.Scatter(
-                y=bicycle_trend['monthly_values'],
-                mode='lines',
-                line=dict(color='#ff7f0e', width=2),
-                fill='tozeroy',
-                fillcolor='rgba(255, 127, 14, 0.2)'
-            ))
-            fig_spark.update_layout(
-                height=60,
-                margin=dict(l=0, r=0, t=0, b=0),
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                showlegend=False,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)'
+            fig_spark = sparkline_figure(
+                bicycle_trend['monthly_values'], '#ff7f0e', 'rgba(255, 127, 14, 0.2)'
             )
             config = {"displayModeBar": False}
             st.plotly_chart(
@@ -295,8 +649,8 @@ try:
             st.metric("Bicycle Accidents", bicycle_accidents)
     
     with col4:
-        pedestrian_accidents = len(filtered_df[filtered_df['AccidentInvolvingPedestrian'] == 'true'])
-        pedestrian_trend = calculate_monthly_trends(filtered_df, 'pedestrian')
+        pedestrian_accidents = int(tile_counts['AccidentInvolvingPedestrian'])
+        pedestrian_trend = monthly_trends['pedestrian']
         if pedestrian_trend:
             st.metric(
                 "Pedestrian Accidents", 
@@ -305,22 +659,8 @@ try:
                 delta_color="inverse"
             )
             # Sparkline
-            fig_spark = go.Figure()
-            fig_spark.add_trace(go.Scatter(
-                y=pedestrian_trend['monthly_values'],
-                mode='lines',
-                line=dict(color='#2ca02c', width=2),
-                fill='tozeroy',
-                fillcolor='rgba(44, 160, 44, 0.2)'
-            ))
-            fig_spark.update_layout(
-                height=60,
-                margin=dict(l=0, r=0, t=0, b=0),
-                xaxis=dict(visible=False),
-                yaxis=dict(visible=False),
-                showlegend=False,
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)'
+            fig_spark = sparkline_figure(
+                pedestrian_trend['monthly_values'], '#2ca02c', 'rgba(44, 160, 44, 0.2)'
             )
             config = {"displayModeBar": False}
             st.plotly_chart(
@@ -331,45 +671,17 @@ try:
         else:
             st.metric("Pedestrian Accidents", pedestrian_accidents)
     
-    # Tabs for different views
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["🗺️ Map View", "📊 Analytics", "⏰ Temporal Patterns", "🔥 Hotspots", "🚴 Cyclist Safety", "📋 Data Table"])
+    # Views (unlike st.tabs, which runs every tab body on each rerun, only the selected
+    # view is built)
+    active_view = st.segmented_control("View", VIEWS, default=VIEWS[0], key="active_view",
+                                       label_visibility="collapsed") or VIEWS[0]
+    (show_map, show_analytics, show_temporal, show_hotspots,
+     show_cyclist, show_table) = [active_view == view for view in VIEWS]
     
-    with tab1:
-        st.subheader("Accident Locations Across Switzerland", 
-                     help="""Interactive map showing accident locations with options for heatmap and individual markers. 
-                             Reduce filters to see individual markers if too many accidents are present.
-                             Click on markers for detailed info.
-                     """)
-
-        col1, col2 = st.columns([3, 1])
-
-        with col2:
-            map_style = st.selectbox("Map View", ["Normal", "Heatmap"], key="map_style")
-            show_markers = st.checkbox("Show Individual Markers", 
-                                       value=True,
-                                       help="Colors markers by severity. Disable to see heatmap only.",
-                                    )
-
-        with col1:
-            if map_style == "Heatmap":
-                m = create_heatmap(filtered_df)  # uses slim create_base_map()
-            else:
-                m = create_base_map()
-                if show_markers and len(filtered_df) <= 1000:
-                    m = add_accident_markers(m, filtered_df)
-                elif len(filtered_df) > 1000:
-                    st.info(
-                        f"Showing heatmap view due to large number of accidents ({len(filtered_df)}). "
-                        "Uncheck some filters to see individual markers."
-                    )
-                    m = create_heatmap(filtered_df)
-
-            # Always zoom to current filtered data
-            m = fit_map_to_df(m, filtered_df, lat_col="Latitude", lon_col="Longitude", pad_deg=0.01)
-
-            st_folium(m, use_container_width=True, height=500, key="main_map")
+    if show_map:
+        render_map_tab(filtered_df, filter_key)
     
-    with tab2:
+    if show_analytics:
         st.subheader("📊 Accident Analytics")
         
         # Create charts
@@ -377,7 +689,7 @@ try:
         
         with col1:
             # Severity distribution
-            severity_counts = filtered_df['AccidentSeverityCategory_en'].value_counts()
+            severity_counts = distributions['severity']
             fig_severity = px.pie(
                 values=severity_counts.values,
                 hole=0.4,
@@ -393,7 +705,7 @@ try:
         
         with col2:
             # Accident types
-            type_counts = filtered_df['AccidentType_en'].value_counts().head(10)
+            type_counts = distributions['types']
             fig_types = px.bar(
                 x=type_counts.values,
                 y=type_counts.index,
@@ -414,7 +726,7 @@ try:
         
         with col1:
             # Road type analysis
-            road_counts = filtered_df['RoadType_en'].value_counts()
+            road_counts = distributions['road']
             fig_road = px.bar(
                 x=road_counts.index,
                 y=road_counts.values,
@@ -431,7 +743,7 @@ try:
         
         with col2:
             # Canton analysis
-            canton_counts = filtered_df['CantonCode'].value_counts().head(10)
+            canton_counts = distributions['canton']
             fig_canton = px.bar(
                 x=canton_counts.index,
                 y=canton_counts.values,
@@ -444,7 +756,7 @@ try:
                 use_container_width=True,   # replaces width='stretch'
                 )
     
-    with tab3:
+    if show_temporal:
         st.subheader("⏰ Temporal Patterns")
         
         # Temporal analysis
@@ -452,9 +764,8 @@ try:
         
         with col1:
             # Monthly distribution
-            monthly_data = filtered_df.groupby('AccidentMonth').size().reset_index(name='count')
-            monthly_data['AccidentMonth'] = monthly_data['AccidentMonth'].astype(int)
-            monthly_data['Month'] = monthly_data['AccidentMonth'].map(lambda x: month_names[x-1])
+            monthly_data = int_counts_frame(distributions['monthly'], 'AccidentMonth')
+            monthly_data['Month'] = np.asarray(month_names)[monthly_data['AccidentMonth'].to_numpy() - 1]
             
             fig_monthly = px.line(
                 monthly_data,
@@ -472,8 +783,7 @@ try:
         
         with col2:
             # Hourly distribution
-            hourly_data = filtered_df.groupby('AccidentHour').size().reset_index(name='count')
-            hourly_data['AccidentHour'] = hourly_data['AccidentHour'].astype(int)
+            hourly_data = int_counts_frame(distributions['hourly'], 'AccidentHour')
             
             fig_hourly = px.bar(
                 hourly_data,
@@ -491,11 +801,7 @@ try:
                 )
         
         # Weekly pattern
-        weekday_data = filtered_df.groupby('AccidentWeekDay_en').size().reset_index(name='count')
-        # Reorder days of week
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        weekday_data['AccidentWeekDay_en'] = pd.Categorical(weekday_data['AccidentWeekDay_en'], categories=day_order, ordered=True)
-        weekday_data = weekday_data.sort_values('AccidentWeekDay_en')
+        weekday_data = weekday_counts_frame(distributions['weekday'])
         
         fig_weekday = px.bar(
             weekday_data,
@@ -514,11 +820,7 @@ try:
         
         # Heatmap: Hour vs Day of Week
         if not filtered_df.empty:
-            heatmap_data = filtered_df.groupby(['AccidentWeekDay_en', 'AccidentHour']).size().reset_index(name='count')
-            heatmap_pivot = heatmap_data.pivot(index='AccidentWeekDay_en', columns='AccidentHour', values='count').fillna(0)
-            
-            # Reorder rows
-            heatmap_pivot = heatmap_pivot.reindex(day_order)
+            heatmap_pivot = distributions['weekday_hour']
             
             fig_heatmap = px.imshow(
                 heatmap_pivot,
@@ -536,7 +838,7 @@ try:
         # Seasonal analysis
         st.subheader("🌦️ Seasonal Patterns")
         
-        seasonal_data = analyze_seasonal_patterns(filtered_df.copy())
+        seasonal_data = cached_seasonal_patterns(filtered_df, filter_key)
         
         if seasonal_data and 'accident_counts' in seasonal_data:
             col1, col2 = st.columns(2)
@@ -589,7 +891,7 @@ try:
         # Year-over-year trends
         st.subheader("📆 Year-over-Year Trends")
         
-        trends_data = calculate_year_over_year_trends(filtered_df.copy())
+        trends_data = cached_year_over_year_trends(filtered_df, filter_key)
         
         if trends_data and 'yearly_counts' in trends_data:
             col1, col2 = st.columns(2)
@@ -636,97 +938,35 @@ try:
                         use_container_width=True,   # replaces width='stretch'
                         )
     
-    with tab4:
-        st.subheader("🔥 Accident Hotspots & Blackspot Zones")
-        
-        # Clustering parameters
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col2:
-            cluster_distance = st.slider("Cluster Distance (km)", 0.1, 2.0, 0.5, 0.1)
-        with col3:
-            min_accidents = st.slider("Min Accidents per Zone", 3, 15, 5, 1)
-        
-        # Identify blackspot zones using DBSCAN clustering
-        blackspots_df = identify_blackspot_zones(filtered_df.copy(), eps_km=cluster_distance, min_samples=min_accidents)
-        
-        # Display map with blackspot
-        st.write("**Identified Blackspot Zones**")
-        if not blackspots_df.empty:
-            blackspot_map = create_blackspot_map(blackspots_df, basemap_style='opensreetmap')
-            st_folium(blackspot_map, width=None, height=400)
-        else:
-            st.info("No blackspot zones identified with current parameters. Try adjusting the cluster distance or minimum accidents.")
-        
-        # Display blackspot statistics
-        if not blackspots_df.empty:
-            st.subheader("Top 10 Blackspot Zones")
-            
-            display_blackspots = blackspots_df.head(10)[['canton', 'accident_count', 'fatal_accidents', 
-                                                          'severe_accidents', 'bicycle_accidents', 
-                                                          'most_common_type', 'risk_score']].copy()
-            display_blackspots.columns = ['Canton', 'Total', 'Fatal', 'Severe', 'Bicycle', 'Common Type', 'Risk Score']
-            st.dataframe(display_blackspots, width='stretch')
-        
-        # Risk factors analysis
-        st.subheader("Risk Factor Analysis")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.write("**🚴‍♂️ Cyclist Risk Factors:**")
-            bicycle_df = filtered_df[filtered_df['AccidentInvolvingBicycle'] == 'true']
-            if not bicycle_df.empty:
-                bike_severity = bicycle_df['AccidentSeverityCategory_en'].value_counts()
-                for severity, count in bike_severity.items():
-                    st.write(f"• {severity}: {count}")
-            else:
-                st.write("No bicycle accidents in filtered data")
-        
-        with col2:
-            st.write("**🚶‍♂️ Pedestrian Risk Factors:**")
-            pedestrian_df = filtered_df[filtered_df['AccidentInvolvingPedestrian'] == 'true']
-            if not pedestrian_df.empty:
-                ped_severity = pedestrian_df['AccidentSeverityCategory_en'].value_counts()
-                for severity, count in ped_severity.items():
-                    st.write(f"• {severity}: {count}")
-            else:
-                st.write("No pedestrian accidents in filtered data")
-        
-        with col3:
-            st.write("**🏍️ Motorcycle Risk Factors:**")
-            motorcycle_df = filtered_df[filtered_df['AccidentInvolvingMotorcycle'] == 'true']
-            if not motorcycle_df.empty:
-                moto_severity = motorcycle_df['AccidentSeverityCategory_en'].value_counts()
-                for severity, count in moto_severity.items():
-                    st.write(f"• {severity}: {count}")
-            else:
-                st.write("No motorcycle accidents in filtered data")
+    if show_hotspots:
+        render_hotspots_tab(filtered_df, filter_key)
     
-    with tab5:
+    if show_cyclist:
         st.subheader("🚴 Cyclist Safety Dashboard")
         
         # Filter for bicycle accidents only
-        bicycle_df = filtered_df[filtered_df['AccidentInvolvingBicycle'] == 'true'].copy()
+        bicycle_df = filtered_df[filtered_df['AccidentInvolvingBicycle']]
         
         if bicycle_df.empty:
             st.warning("No bicycle accidents found in the filtered data. Adjust filters to see cyclist safety information.")
         else:
             # Key metrics for cyclists
+            bike_severity_counts = bicycle_df[['_fatal', '_severe', '_light']].sum()
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
                 st.metric("Total Bicycle Accidents", len(bicycle_df))
             
             with col2:
-                fatal_bike = len(bicycle_df[bicycle_df['AccidentSeverityCategory'] == 'as1'])
+                fatal_bike = int(bike_severity_counts['_fatal'])
                 st.metric("Fatal", fatal_bike, delta=None, delta_color="inverse")
             
             with col3:
-                severe_bike = len(bicycle_df[bicycle_df['AccidentSeverityCategory'] == 'as2'])
+                severe_bike = int(bike_severity_counts['_severe'])
                 st.metric("Severe Injuries", severe_bike, delta=None, delta_color="inverse")
             
             with col4:
-                light_bike = len(bicycle_df[bicycle_df['AccidentSeverityCategory'] == 'as3'])
+                light_bike = int(bike_severity_counts['_light'])
                 st.metric("Light Injuries", light_bike)
             
             # Risk analysis visualizations
@@ -736,8 +976,8 @@ try:
             
             with col1:
                 # Bicycle accidents by hour
-                hourly_bike = bicycle_df.groupby('AccidentHour').size().reset_index(name='count')
-                hourly_bike['AccidentHour'] = hourly_bike['AccidentHour'].astype(int)
+                hourly_bike = int_counts_frame(value_counts_observed(bicycle_df['AccidentHour']).sort_index(),
+                                               'AccidentHour')
                 
                 fig_bike_hour = px.bar(
                     hourly_bike,
@@ -757,10 +997,7 @@ try:
             
             with col2:
                 # Bicycle accidents by day of week
-                weekday_bike = bicycle_df.groupby('AccidentWeekDay_en').size().reset_index(name='count')
-                day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                weekday_bike['AccidentWeekDay_en'] = pd.Categorical(weekday_bike['AccidentWeekDay_en'], categories=day_order, ordered=True)
-                weekday_bike = weekday_bike.sort_values('AccidentWeekDay_en')
+                weekday_bike = weekday_counts_frame(value_counts_observed(bicycle_df['AccidentWeekDay_en']))
                 
                 fig_bike_day = px.bar(
                     weekday_bike,
@@ -778,7 +1015,7 @@ try:
             
             with col1:
                 # Road type for bicycle accidents
-                road_bike = bicycle_df['RoadType_en'].value_counts().head(5)
+                road_bike = value_counts_observed(bicycle_df['RoadType_en']).head(5)
                 fig_bike_road = px.pie(
                     values=road_bike.values,
                     hole=0.4,
@@ -789,7 +1026,7 @@ try:
             
             with col2:
                 # Accident types for bicycles
-                type_bike = bicycle_df['AccidentType_en'].value_counts().head(5)
+                type_bike = value_counts_observed(bicycle_df['AccidentType_en']).head(5)
                 fig_bike_type = px.pie(
                     values=type_bike.values,
                     hole=0.4,
@@ -801,14 +1038,14 @@ try:
             # Bicycle blackspots
             st.subheader("🎯 Bicycle Accident Blackspots")
             
-            bicycle_blackspots = identify_blackspot_zones(bicycle_df, eps_km=0.3, min_samples=3)
+            bicycle_blackspots = cached_blackspot_zones(bicycle_df, filter_key, 'bicycle', 0.3, 3)
             
             if not bicycle_blackspots.empty:
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    bike_blackspot_map = create_blackspot_map(bicycle_blackspots, basemap_style='Swiss Topo')
-                    st_folium(bike_blackspot_map, width=None, height=400)
+                    components.html(cached_blackspot_map_html(bicycle_blackspots, filter_key, 'bicycle', 0.3, 3,
+                                                              'Swiss Topo'), height=400)
                 
                 with col2:
                     st.write("**Top Cyclist Risk Zones:**")
@@ -822,16 +1059,17 @@ try:
             st.subheader("💡 Cyclist Safety Recommendations")
             
             # Calculate peak risk times
-            peak_hour = bicycle_df['AccidentHour'].mode().iloc[0] if not bicycle_df['AccidentHour'].mode().empty else None
-            peak_day = bicycle_df['AccidentWeekDay_en'].mode().iloc[0] if not bicycle_df['AccidentWeekDay_en'].mode().empty else None
-            dangerous_road = bicycle_df['RoadType_en'].mode().iloc[0] if not bicycle_df['RoadType_en'].mode().empty else None
+            bicycle_summary = cached_bicycle_summary(filtered_df, filter_key)
+            peak_hour_range = bicycle_summary['peak_hour_range']
+            peak_day = bicycle_summary['peak_day']
+            dangerous_road = bicycle_summary['dangerous_road']
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.warning(f"""
                 **High-Risk Periods:**
-                - Peak accident hour: {peak_hour}:00-{int(peak_hour)+1}:00
+                - Peak accident hour: {peak_hour_range}
                 - Highest risk day: {peak_day}
                 - Most dangerous roads: {dangerous_road}
                 """)
@@ -848,7 +1086,7 @@ try:
             # Predictive insights for route planning
             st.subheader("🔮 Predictive Risk Insights for Route Planning")
             
-            risk_predictions = generate_risk_predictions(filtered_df.copy())
+            risk_predictions = cached_risk_predictions(filtered_df, filter_key)
             
             if risk_predictions:
                 col1, col2 = st.columns(2)
@@ -856,65 +1094,27 @@ try:
                 with col1:
                     st.write("**⚠️ High-Risk Time/Location Combinations:**")
                     if 'day_hour_risks' in risk_predictions and risk_predictions['day_hour_risks']:
-                        risk_df = pd.DataFrame(risk_predictions['day_hour_risks'][:5])
-                        risk_df.columns = ['Day', 'Hour', 'Accidents']
+                        risk_df = pd.DataFrame(
+                            [(risk['AccidentWeekDay_en'], risk['AccidentHour'], risk['count'])
+                             for risk in risk_predictions['day_hour_risks'][:5]],
+                            columns=['Day', 'Hour', 'Accidents'])
                         st.dataframe(risk_df, width='stretch', hide_index=True)
                 
                 with col2:
                     st.write("**🚴 Cyclist-Specific High-Risk Combinations:**")
                     if 'bicycle_hour_road_risks' in risk_predictions and risk_predictions['bicycle_hour_road_risks']:
-                        bike_risk_df = pd.DataFrame(risk_predictions['bicycle_hour_road_risks'][:5])
-                        bike_risk_df.columns = ['Hour', 'Road Type', 'Accidents']
+                        bike_risk_df = pd.DataFrame(
+                            [(risk['AccidentHour'], risk['RoadType_en'], risk['count'])
+                             for risk in risk_predictions['bicycle_hour_road_risks'][:5]],
+                            columns=['Hour', 'Road Type', 'Accidents'])
                         st.dataframe(bike_risk_df, width='stretch', hide_index=True)
                 
                 # Route planning recommendations
                 if 'recommendations' in risk_predictions and risk_predictions['recommendations']:
-                    st.info("**📍 Route Planning Tips:**\n" + "\n".join([f"• {rec}" for rec in risk_predictions['recommendations']]))
+                    st.info("**📍 Route Planning Tips:**\n• " + "\n• ".join(risk_predictions['recommendations']))
     
-    with tab6:
-        st.subheader("📋 Detailed Accident Data")
-        
-        # Display options
-        col1, col2 = st.columns([3, 1])
-        
-        with col2:
-            show_columns = st.multiselect(
-                "Select Columns to Display",
-                options=['AccidentUID', 'AccidentType_en', 'AccidentSeverityCategory_en', 
-                        'RoadType_en', 'CantonCode', 'AccidentYear', 'AccidentMonth_en',
-                        'AccidentWeekDay_en', 'AccidentHour_text', 'AccidentInvolvingBicycle',
-                        'AccidentInvolvingPedestrian', 'AccidentInvolvingMotorcycle'],
-                default=['AccidentType_en', 'AccidentSeverityCategory_en', 'CantonCode', 
-                        'AccidentYear', 'AccidentInvolvingBicycle']
-            )
-        
-        with col1:
-            if show_columns:
-                display_df = filtered_df[show_columns].copy()
-
-                # Format boolean columns
-                for col in ['AccidentInvolvingBicycle', 'AccidentInvolvingPedestrian', 'AccidentInvolvingMotorcycle']:
-                    if col in display_df.columns:
-                        display_df[col] = display_df[col].map({'true': '✓', 'false': '✗'})
-
-                st.dataframe(display_df, width='stretch', height=400)
-
-                # --- robust download: bytes + stable key ---
-                if not display_df.empty:
-                    csv_bytes = display_df.to_csv(index=False).encode("utf-8")
-                    # make the key stable across re-runs; tie it to columns+rowcount, not transient ids
-                    dl_key = f"dl_csv_{'_'.join(show_columns)}_{len(display_df)}"
-                    st.download_button(
-                        label="Download filtered data as CSV",
-                        data=csv_bytes,
-                        file_name="swiss_accidents_filtered.csv",
-                        mime="text/csv",
-                        key=dl_key,
-                    )
-                else:
-                    st.info("No rows to download with current filters.")
-            else:
-                st.info("Please select columns to display")
+    if show_table:
+        render_data_table_tab(filtered_df, filter_key)
 
 
     # Footer with insights
@@ -922,9 +1122,10 @@ try:
     st.subheader("🎯 Key Insights for Cyclists")
     
     if not filtered_df.empty:
-        bicycle_accidents = len(filtered_df[filtered_df['AccidentInvolvingBicycle'] == 'true'])
+        bicycle_accidents = int(tile_counts['AccidentInvolvingBicycle'])
         total_accidents = len(filtered_df)
         bicycle_percentage = (bicycle_accidents / total_accidents) * 100 if total_accidents > 0 else 0
+        bicycle_summary = cached_bicycle_summary(filtered_df, filter_key) if bicycle_accidents > 0 else None
         
         col1, col2, col3 = st.columns(3)
         
@@ -933,16 +1134,15 @@ try:
         
         with col2:
             # Peak risk hours for cyclists
-            if bicycle_accidents > 0:
-                bicycle_df = filtered_df[filtered_df['AccidentInvolvingBicycle'] == 'true']
-                peak_hour = bicycle_df['AccidentHour'].mode().iloc[0] if not bicycle_df['AccidentHour'].mode().empty else "N/A"
-                st.warning(f"⚠️ **Peak Risk Hour**: {peak_hour}:00-{int(peak_hour)+1 if peak_hour != 'N/A' else 'N/A'}:00 for cyclists")
+            if bicycle_summary is not None:
+                st.warning(f"⚠️ **Peak Risk Hour**: {bicycle_summary['peak_hour_range']} for cyclists")
         
         with col3:
             # Most dangerous road type for cyclists
-            if bicycle_accidents > 0:
-                bicycle_df = filtered_df[filtered_df['AccidentInvolvingBicycle'] == 'true']
-                dangerous_road = bicycle_df['RoadType_en'].mode().iloc[0] if not bicycle_df['RoadType_en'].mode().empty else "N/A"
+            if bicycle_summary is not None:
+                dangerous_road = bicycle_summary['dangerous_road']
+                if dangerous_road is None:
+                    dangerous_road = "N/A"
                 st.error(f"🛣️ **High-Risk Roads**: {dangerous_road}")
 
 except Exception as e:
@@ -952,44 +1152,7 @@ except Exception as e:
 st.divider()
 # Footer with credits and links
 st.subheader("🔗 Credits & Links")
-st.markdown("""
-            Created by @Giovanni Lopez 🚴‍♂️ while attending the 2025 Cycling HACK in Zürich
-            Using Streamlit 🚀 Magic, GNU GENERAL PUBLIC LICENSE Version 3, 29 June 2007
-            - Event Page: 
-                - https://cyclinghack.ch/events/zurich-2025/
-            - Dataset opendata.swiss:
-                - https://opendata.swiss/en/dataset/polizeilich-registrierte-verkehrsunfalle-auf-dem-stadtgebiet-zurich-seit-2011
-                - https://opendata.swiss/en/dataset/polizeilich-registrierte-verkehrsunfalle-auf-dem-stadtgebiet-zurich-seit-2011/resource/d2ba4c0b-3428-47a2-b19d-d6fb2a86814d
-            - Who am I?:
-                - https://www.linkedin.com/in/giovlopez/
-                - https://www.instagram.com/giobcflowy/ 
-            - Explore more projects:
-                - https://bikeflow.ch
-                - https://mapaqua.ch/ (Native App for iOS and Android in development 🙂)
-                - https://makinita.ch
-
-            Buy me a coffee ☕: https://buymeacoffee.com/bikeflow
-            ,or a two ☕☕: https://www.paypal.com/ncp/payment/CJVK8M6HLW3C2
-""")
+st.markdown(CREDITS_MD)
 
 # Data Disclaimer
-st.markdown("""
-    <div style='background-color: #f0f2f6; padding: 20px; border-radius: 5px; margin-top: 20px;'>
-    <h4 style='margin-top: 0;'>⚠️ Data Disclaimer</h4>
-    <p style='font-size: 14px; line-height: 1.6;'>
-    This dashboard and its visualizations have been created with the best intentions to provide insights into Swiss road traffic accidents. 
-    While reasonable checks and validations have been performed on the data and analysis, the information presented may contain errors, 
-    inaccuracies, or incomplete representations.
-    </p>
-    <p style='font-size: 14px; line-height: 1.6;'>
-    <strong>Important:</strong> Before making any decisions, implementing safety measures, or taking actions based on the information 
-    provided in this dashboard, users must conduct comprehensive verification, testing, and validation of the data and findings. 
-    This tool is intended for informational and analytical purposes only and should not be the sole basis for critical decisions 
-    related to road safety, urban planning, or policy making.
-    </p>
-    <p style='font-size: 14px; line-height: 1.6; margin-bottom: 0;'>
-    The creators and maintainers of this dashboard assume no liability for any decisions made or actions taken based on the 
-    information presented herein.
-    </p>
-    </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(DISCLAIMER_HTML, unsafe_allow_html=True)
\ No newline at end of file
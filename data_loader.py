@@ -1,20 +1,127 @@
 import json
+import os
+import threading
+from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
 from replit.object_storage import Client
 
-def load_accident_data(file_path, use_object_storage=False):
+# Low-cardinality text columns stored as categoricals, so filtering, grouping
+# and counting work on small integer codes instead of Python strings
+CATEGORICAL_COLUMNS = [
+    'CantonCode',
+    'AccidentType_en',
+    'AccidentSeverityCategory',
+    'AccidentSeverityCategory_en',
+    'RoadType_en',
+    'AccidentWeekDay_en',
+    'AccidentMonth_en',
+    'AccidentHour_text',
+    'LightCondition_en',
+    'WeatherCondition_en',
+]
+
+# Weekday categories in calendar order, so sorting and codes run Monday to Sunday
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+WEEKDAY_DTYPE = pd.CategoricalDtype(DAY_ORDER, ordered=True)
+
+# 'true'/'false' text flags stored as bool columns
+FLAG_COLUMNS = [
+    'AccidentInvolvingPedestrian',
+    'AccidentInvolvingBicycle',
+    'AccidentInvolvingMotorcycle',
+]
+
+# Columns read by the dashboard (app.py and map_utils.py)
+DASHBOARD_COLUMNS = [
+    'longitude', 'latitude', 'AccidentUID',
+    'AccidentType_en', 'AccidentSeverityCategory', 'AccidentSeverityCategory_en',
+    'RoadType_en', 'CantonCode', 'MunicipalityName',
+    'AccidentYear', 'AccidentMonth', 'AccidentMonth_en', 'AccidentWeekDay_en',
+    'AccidentHour', 'AccidentHour_text',
+    'AccidentInvolvingPedestrian', 'AccidentInvolvingBicycle', 'AccidentInvolvingMotorcycle',
+    'LightCondition_en', 'WeatherCondition_en',
+]
+
+# Bump whenever the processing in load_accident_data changes (cleaning, dtypes,
+# CATEGORICAL_COLUMNS, FLAG_COLUMNS), so Parquet caches written by older code are rebuilt
+CACHE_FORMAT_VERSION = 1
+CACHE_METADATA_KEY = b'velo_crash_insights_cache'
+
+def _cache_stamp(file_path):
+    # What a valid cache must have been built from: this loader version and the
+    # source file's exact mtime and size
+    stat = Path(file_path).stat()
+    return {'version': CACHE_FORMAT_VERSION, 'source_mtime_ns': stat.st_mtime_ns,
+            'source_size': stat.st_size}
+
+def _read_parquet_cache(cache_path, stamp, columns=None):
+    # Cached frame, or None when the cache is missing, unreadable or stamped differently
+    try:
+        schema = pq.read_schema(cache_path)
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    metadata = schema.metadata or {}
+    try:
+        if json.loads(metadata.get(CACHE_METADATA_KEY, b'null')) != stamp:
+            return None
+    except ValueError:
+        return None
+    # Read only the requested columns that the cache actually has
+    if columns is not None:
+        available = set(schema.names)
+        columns = [col for col in columns if col in available]
+    try:
+        return pd.read_parquet(cache_path, columns=columns)
+    except (OSError, ValueError, pa.ArrowException):
+        # e.g. a corrupt data page behind an intact footer
+        return None
+
+def _write_parquet_cache(df, cache_path, stamp):
+    # Store the stamp in the schema metadata next to pandas' own metadata
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), CACHE_METADATA_KEY: json.dumps(stamp).encode()}
+    table = table.replace_schema_metadata(metadata)
+    
+    # Write a temporary file in the same directory and move it into place, so readers
+    # never see a partly written cache (an interrupted write leaves no cache at all)
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def load_accident_data(file_path, use_object_storage=False, columns=None):
     """
     Load and process the GeoJSON accident data.
     
+    Local files are parsed once and the processed frame is cached next to them
+    as Parquet (same name, .parquet suffix); later loads read that cache while
+    its metadata matches the current loader version and the JSON file's mtime
+    and size.
+    
     Args:
         file_path (str): Path to the GeoJSON file (local or object name in bucket)
         use_object_storage (bool): Whether to load from Object Storage
+        columns (list): Columns to keep (missing ones are skipped); None keeps all
         
     Returns:
         pandas.DataFrame: Processed accident data
     """
     try:
+        cache_path = None if use_object_storage else Path(file_path).with_suffix('.parquet')
+        if cache_path is not None:
+            stamp = _cache_stamp(file_path)
+            df = _read_parquet_cache(cache_path, stamp, columns) if cache_path.exists() else None
+            if df is not None:
+                st.success(f"Successfully loaded {len(df)} accident records")
+                return df
+        
         # Load GeoJSON data
         if use_object_storage:
             client = Client()
@@ -63,32 +170,54 @@ def load_accident_data(file_path, use_object_storage=False):
         df = pd.DataFrame(rows)
         
         # Data cleaning and type conversion
+        # (downcast to the smallest integer type that fits, e.g. int16 years and
+        # int8 months/hours; columns with missing values stay float)
         # Convert string years to integers for proper sorting
         if 'AccidentYear' in df.columns:
-            df['AccidentYear'] = pd.to_numeric(df['AccidentYear'], errors='coerce')
+            df['AccidentYear'] = pd.to_numeric(df['AccidentYear'], errors='coerce', downcast='integer')
         
         # Convert month to integer
         if 'AccidentMonth' in df.columns:
-            df['AccidentMonth'] = pd.to_numeric(df['AccidentMonth'], errors='coerce')
+            df['AccidentMonth'] = pd.to_numeric(df['AccidentMonth'], errors='coerce', downcast='integer')
         
         # Convert hour to integer
         if 'AccidentHour' in df.columns:
-            df['AccidentHour'] = pd.to_numeric(df['AccidentHour'], errors='coerce')
-        
-        # Handle missing values
-        df = df.dropna(subset=['longitude', 'latitude'])
+            df['AccidentHour'] = pd.to_numeric(df['AccidentHour'], errors='coerce', downcast='integer')
         
-        # Validate coordinate ranges for Switzerland
+        # Validate coordinate ranges for Switzerland in one mask over the raw arrays
+        # (missing coordinates are NaN and fail every comparison, so they drop too)
         # Switzerland approximate bounds: lat 45.8-47.8, lon 5.9-10.5
-        df = df[
-            (df['latitude'].between(45.0, 48.0)) & 
-            (df['longitude'].between(5.0, 11.0))
-        ]
+        lat = df['latitude'].to_numpy(dtype=float)
+        lon = df['longitude'].to_numpy(dtype=float)
+        df = df[(lat >= 45.0) & (lat <= 48.0) & (lon >= 5.0) & (lon <= 11.0)]
         
         if df.empty:
             st.error("No valid accidents found within Switzerland's boundaries.")
             return pd.DataFrame()
         
+        # Store coordinates as float32 (about 0.5 m resolution at Swiss latitudes)
+        df = df.astype({'latitude': 'float32', 'longitude': 'float32'})
+        
+        # Convert low-cardinality text columns to categoricals
+        df = df.astype({col: WEEKDAY_DTYPE if col == 'AccidentWeekDay_en' else 'category'
+                        for col in CATEGORICAL_COLUMNS if col in df.columns})
+        
+        # Convert involved-party flags to bool (missing values count as false)
+        for col in FLAG_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].to_numpy() == 'true'
+        
+        # Cache the processed frame (all columns) for the next load; a read-only
+        # location just means the JSON is parsed again next time
+        if cache_path is not None:
+            try:
+                _write_parquet_cache(df, cache_path, stamp)
+            except (OSError, ValueError):
+                pass
+        
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        
         st.success(f"Successfully loaded {len(df)} accident records")
         return df
         
@@ -124,9 +253,9 @@ def get_data_summary(df):
         'cantons': df['CantonCode'].nunique() if 'CantonCode' in df.columns else 0,
         'accident_types': df['AccidentType'].nunique() if 'AccidentType' in df.columns else 0,
         'severity_distribution': df['AccidentSeverityCategory_en'].value_counts().to_dict() if 'AccidentSeverityCategory_en' in df.columns else {},
-        'involving_bicycle': len(df[df['AccidentInvolvingBicycle'] == 'true']) if 'AccidentInvolvingBicycle' in df.columns else 0,
-        'involving_pedestrian': len(df[df['AccidentInvolvingPedestrian'] == 'true']) if 'AccidentInvolvingPedestrian' in df.columns else 0,
-        'involving_motorcycle': len(df[df['AccidentInvolvingMotorcycle'] == 'true']) if 'AccidentInvolvingMotorcycle' in df.columns else 0
+        'involving_bicycle': int(df['AccidentInvolvingBicycle'].sum()) if 'AccidentInvolvingBicycle' in df.columns else 0,
+        'involving_pedestrian': int(df['AccidentInvolvingPedestrian'].sum()) if 'AccidentInvolvingPedestrian' in df.columns else 0,
+        'involving_motorcycle': int(df['AccidentInvolvingMotorcycle'].sum()) if 'AccidentInvolvingMotorcycle' in df.columns else 0
     }
     
     return summary
@@ -1,5 +1,7 @@
+import copy
+import functools
 import folium
-from folium.plugins import HeatMap, LocateControl, Fullscreen, Draw, MiniMap, MousePosition, MeasureControl, Geocoder
+from folium.plugins import HeatMap, LocateControl, Fullscreen, Draw, MiniMap, MousePosition, MeasureControl, Geocoder, FastMarkerCluster, MarkerCluster
 import pandas as pd
 import numpy as np
 
@@ -8,9 +10,16 @@ import folium
 from folium.plugins import HeatMap, LocateControl, Fullscreen
 
 def create_base_map(basemap_style='OpenStreetMap'):
-    # Center on Switzerland; zoom gets overridden by fit_map_to_df
+    # Every map starts from a copy of one prebuilt scaffold (tiles and controls do
+    # not depend on the data), which is much cheaper than building it again
+    return copy.deepcopy(_base_map_template(basemap_style))
+
+@functools.lru_cache(maxsize=None)
+def _base_map_template(basemap_style):
+    # Center on Switzerland; zoom gets overridden by fit_map_to_df. Vector layers
+    # (circle markers, blackspot circles) draw on one canvas instead of SVG nodes.
     m = folium.Map(location=[47.38, 8.55], zoom_start=13, tiles='OpenStreetMap',
-                   scrollWheelZoom=False, options={'wheelPxPerZoomLevel': 120})
+                   scrollWheelZoom=False, prefer_canvas=True, options={'wheelPxPerZoomLevel': 120})
 
     # CyclOSM overlay (always on; no layer control)
     folium.TileLayer(
@@ -66,6 +75,113 @@ def get_severity_icon(severity):
     
     return icon_map.get(severity, 'circle')
 
+# Above this many markers add_accident_markers hands the points to FastMarkerCluster,
+# which builds and clusters the markers in the browser
+MARKER_CLUSTER_THRESHOLD = 200
+
+# Decimal places kept when coordinates are written into the map (about 0.1 m)
+COORD_DECIMALS = 6
+
+# Leaflet marker built client-side from a [lat, lon, color, type, severity, road type,
+# weather, lighting, year, month, hour, canton, municipality, party bitmask] row
+# (see add_clustered_markers); the popup HTML is only built when a marker is clicked
+FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+                                {radius: 7, color: row[2], fillColor: row[2], fillOpacity: 0.7, weight: 1});
+    marker.bindTooltip(row[3] + ' • ' + row[4] + ' • ' + row[8]);
+    marker.bindPopup(function () {
+        var party = function (bit) { return (row[13] & bit) ? '✅' : '❌'; };
+        return '<div style="width: 250px; font-size: 13px; line-height: 1.3;">'
+            + '<h4 style="margin-bottom:4px; color:#d9534f;">🚦 ' + row[3] + '</h4>'
+            + '<b>Severity:</b> ' + row[4] + '<br>'
+            + '<b>Road type:</b> ' + row[5] + '<br>'
+            + '<b>Weather:</b> ' + row[6] + '<br>'
+            + '<b>Lighting:</b> ' + row[7] + '<br>'
+            + '<hr style="margin:4px 0;">'
+            + '<b>Date:</b> ' + (row[8] || 'N/A') + '-' + row[9] + ' at ' + row[10] + '<br>'
+            + '<b>Canton:</b> ' + row[11] + '<br>'
+            + '<b>Municipality:</b> ' + row[12] + '<br>'
+            + '<hr style="margin:4px 0;">'
+            + '<b>Parties involved:</b><br>'
+            + '🚲 Bicycle: ' + party(1) + '<br>'
+            + '🚶 Pedestrian: ' + party(2) + '<br>'
+            + '🏍️ Motorcycle: ' + party(4) + '<br>'
+            + '</div>';
+    }, {maxWidth: 250});
+    return marker;
+}
+"""
+
+# Involved-party flags and their bits in the fast-marker party bitmask
+PARTY_BITS = [('AccidentInvolvingBicycle', 1), ('AccidentInvolvingPedestrian', 2),
+              ('AccidentInvolvingMotorcycle', 4)]
+
+def _column_text(df, col, default):
+    # Column as strings for marker labels, or the default when the column is absent
+    if col not in df.columns:
+        return pd.Series(default, index=df.index)
+    return df[col].astype(str)
+
+def _month_text(df):
+    # Zero-padded month numbers as strings ('N/A' when missing)
+    if 'AccidentMonth' not in df.columns:
+        return pd.Series('N/A', index=df.index)
+    month = pd.to_numeric(df['AccidentMonth'], errors='coerce')
+    return month.astype('Int64').astype(str).str.zfill(2).where(month.notna(), 'N/A')
+
+def _party_bits(df):
+    # Involved parties as one bitmask per row (see PARTY_BITS)
+    bits = np.zeros(len(df), dtype=np.int64)
+    for col, bit in PARTY_BITS:
+        if col in df.columns:
+            bits[np.asarray(df[col], dtype=bool)] |= bit
+    return bits
+
+def add_clustered_markers(m, df):
+    """
+    Add accident markers as client-side clusters, one cluster layer per severity.
+    
+    Markers carry the same tooltip and popup details as the individual markers
+    drawn by add_accident_markers.
+    
+    Args:
+        m (folium.Map): Map object
+        df (pandas.DataFrame): Accident data
+        
+    Returns:
+        folium.Map: Map with marker clusters added
+    """
+    for severity, group in df.groupby('AccidentSeverityCategory', observed=True):
+        # Round after widening float32 coordinates so they serialize as short decimals
+        lat = pd.to_numeric(group['latitude'], errors='coerce').astype(float).round(COORD_DECIMALS)
+        lon = pd.to_numeric(group['longitude'], errors='coerce').astype(float).round(COORD_DECIMALS)
+        valid = (lat.notna() & lon.notna()).to_numpy()
+        if not valid.any():
+            continue
+        
+        # One row per marker in the order FAST_MARKER_CALLBACK reads it
+        columns = [
+            lat, lon, pd.Series(get_marker_color(severity), index=group.index),
+            _column_text(group, 'AccidentType_en', 'Unknown'),
+            _column_text(group, 'AccidentSeverityCategory_en', 'Unknown'),
+            _column_text(group, 'RoadType_en', 'Unknown'),
+            _column_text(group, 'WeatherCondition_en', 'Unknown'),
+            _column_text(group, 'LightCondition_en', 'Unknown'),
+            _column_text(group, 'AccidentYear', ''),
+            _month_text(group),
+            _column_text(group, 'AccidentHour_text', 'Unknown'),
+            _column_text(group, 'CantonCode', 'Unknown'),
+            _column_text(group, 'MunicipalityName', 'Unknown'),
+            pd.Series(_party_bits(group), index=group.index),
+        ]
+        data = [list(row) for row in zip(*(column.to_numpy()[valid].tolist() for column in columns))]
+        
+        FastMarkerCluster(data, callback=FAST_MARKER_CALLBACK,
+                          name=f"Severity: {severity}").add_to(m)
+    
+    return m
+
 def add_accident_markers(m, df, max_markers=500):
     """
     Add accident markers to the map.
@@ -85,13 +201,20 @@ def add_accident_markers(m, df, max_markers=500):
     if len(df) > max_markers:
         df = df.sample(n=max_markers, random_state=42)
     
+    if len(df) > MARKER_CLUSTER_THRESHOLD:
+        return add_clustered_markers(m, df)
+    
     # Group markers by type for different layers
-    severity_groups = df.groupby('AccidentSeverityCategory')
+    severity_groups = df.groupby('AccidentSeverityCategory', observed=True)
     
     for severity, group in severity_groups:
         feature_group = folium.FeatureGroup(name=f"Severity: {severity}")
+        # Every marker in the group shares the severity's color and fallback icon
+        color = get_marker_color(severity)
+        severity_icon = get_severity_icon(severity)
         
-        for idx, row in group.iterrows():
+        # Plain dicts per row; iterrows would build a Series for every marker
+        for row in group.to_dict('records'):
             try:
                 # Create popup content
                 popup_html = f"""
@@ -107,23 +230,23 @@ def add_accident_markers(m, df, max_markers=500):
                     <b>Municipality:</b> {row.get('MunicipalityName', 'Unknown')}<br>
                     <hr style="margin:4px 0;">
                     <b>Parties involved:</b><br>
-                    🚲 Bicycle: {'✅' if str(row.get('AccidentInvolvingBicycle')).lower() == 'true' else '❌'}<br>
-                    🚶 Pedestrian: {'✅' if str(row.get('AccidentInvolvingPedestrian')).lower() == 'true' else '❌'}<br>
-                    🏍️ Motorcycle: {'✅' if str(row.get('AccidentInvolvingMotorcycle')).lower() == 'true' else '❌'}<br>
+                    🚲 Bicycle: {'✅' if row.get('AccidentInvolvingBicycle') else '❌'}<br>
+                    🚶 Pedestrian: {'✅' if row.get('AccidentInvolvingPedestrian') else '❌'}<br>
+                    🏍️ Motorcycle: {'✅' if row.get('AccidentInvolvingMotorcycle') else '❌'}<br>
                     </div>
                     """
                 # Determine marker style based on involved parties
-                if row.get('AccidentInvolvingBicycle') == 'true':
+                if row.get('AccidentInvolvingBicycle'):
                     icon = 'bicycle'
                     prefix = 'fa'
-                elif row.get('AccidentInvolvingPedestrian') == 'true':
+                elif row.get('AccidentInvolvingPedestrian'):
                     icon = 'walking'
                     prefix = 'fa'
-                elif row.get('AccidentInvolvingMotorcycle') == 'true':
+                elif row.get('AccidentInvolvingMotorcycle'):
                     icon = 'motorcycle'
                     prefix = 'fa'
                 else:
-                    icon = get_severity_icon(severity)
+                    icon = severity_icon
                     prefix = 'glyphicon'
                 
                 # Create marker
@@ -131,7 +254,7 @@ def add_accident_markers(m, df, max_markers=500):
                     location=[row['latitude'], row['longitude']],
                     popup=folium.Popup(popup_html, max_width=250),
                     icon=folium.Icon(
-                        color=get_marker_color(severity),
+                        color=color,
                         icon=icon,
                         prefix=prefix
                     ),
@@ -146,6 +269,15 @@ def add_accident_markers(m, df, max_markers=500):
     
     return m
 
+# Heatmap weights per AccidentSeverityCategory (anything else weighs 1)
+HEATMAP_SEVERITY_WEIGHTS = {'as1': 5, 'as2': 3, 'as3': 1}
+
+# Above this many points the heatmap is drawn from grid cells of
+# HEATMAP_BIN_DECIMALS decimal degrees (~100 m) instead of single accidents
+HEATMAP_BIN_THRESHOLD = 10000
+HEATMAP_BIN_DECIMALS = 3
+HEATMAP_MAX_CELLS = 20000
+
 def create_heatmap(df, basemap_style='OpenStreetMap'):
     """
     Create a heatmap of accident locations.
@@ -162,25 +294,30 @@ def create_heatmap(df, basemap_style='OpenStreetMap'):
     if df.empty:
         return m
     
-    # Prepare data for heatmap
-    heat_data = []
-    for idx, row in df.iterrows():
-        try:
-            lat = float(row['latitude'])
-            lon = float(row['longitude'])
-            
-            # Weight by severity (higher weight for more severe accidents)
-            weight = 1
-            if row.get('AccidentSeverityCategory') == 'as1':  # Fatal
-                weight = 5
-            elif row.get('AccidentSeverityCategory') == 'as2':  # Severe
-                weight = 3
-            elif row.get('AccidentSeverityCategory') == 'as3':  # Light
-                weight = 1
-            
-            heat_data.append([lat, lon, weight])
-        except (ValueError, TypeError):
-            continue
+    # Prepare data for heatmap (rows without usable coordinates are skipped)
+    lat = pd.to_numeric(df['latitude'], errors='coerce').to_numpy(dtype=float).round(COORD_DECIMALS)
+    lon = pd.to_numeric(df['longitude'], errors='coerce').to_numpy(dtype=float).round(COORD_DECIMALS)
+    
+    # Weight by severity (higher weight for more severe accidents)
+    if 'AccidentSeverityCategory' in df.columns:
+        weight = (df['AccidentSeverityCategory'].map(HEATMAP_SEVERITY_WEIGHTS)
+                  .astype(float).fillna(1).to_numpy())
+    else:
+        weight = np.ones(len(df))
+    
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon, weight = lat[valid], lon[valid], weight[valid]
+    
+    if len(lat) > HEATMAP_BIN_THRESHOLD:
+        # Sum weights per grid cell so the browser gets at most HEATMAP_MAX_CELLS points
+        cells = pd.DataFrame({
+            'lat': lat.round(HEATMAP_BIN_DECIMALS),
+            'lon': lon.round(HEATMAP_BIN_DECIMALS),
+            'weight': weight,
+        }).groupby(['lat', 'lon'], sort=False)['weight'].sum().nlargest(HEATMAP_MAX_CELLS)
+        heat_data = [[cell_lat, cell_lon, cell_weight] for (cell_lat, cell_lon), cell_weight in cells.items()]
+    else:
+        heat_data = np.column_stack([lat, lon, weight]).tolist()
     
     if heat_data:
         # Create heatmap
@@ -204,8 +341,6 @@ def create_clustered_map(df):
     Returns:
         folium.Map: Map with clustered markers
     """
-    from folium.plugins import MarkerCluster
-    
     m = create_base_map()
     
     if df.empty:
@@ -214,7 +349,7 @@ def create_clustered_map(df):
     # Create marker cluster
     marker_cluster = MarkerCluster().add_to(m)
     
-    for idx, row in df.iterrows():
+    for row in df.to_dict('records'):
         try:
             popup_html = f"""
             <b>{row.get('AccidentType_en', 'Unknown')}</b><br>
@@ -254,7 +389,7 @@ def create_blackspot_map(blackspots_df, basemap_style='Swiss Topo'):
         return m
     
     # Add circle markers for each blackspot
-    for idx, spot in blackspots_df.iterrows():
+    for spot in blackspots_df.to_dict('records'):
         # Determine color based on risk score
         if spot['risk_score'] >= 50:
             color = 'red'